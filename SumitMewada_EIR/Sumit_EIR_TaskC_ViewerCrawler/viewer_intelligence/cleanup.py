@@ -4,39 +4,43 @@ Cleanup Script - Delete old outputs
 import os
 import shutil
 
+
+def _remove_file(file_path):
+    """Delete a single file, ignoring it if it does not exist"""
+    try:
+        os.unlink(file_path)
+    except FileNotFoundError:
+        return
+    print(f"✓ Deleted: {file_path}")
+
+
+def _clear_directory(dir_path):
+    """Delete all regular files directly inside a directory"""
+    try:
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False):
+                    os.unlink(entry.path)
+                    print(f"✓ Deleted: {entry.path}")
+    except FileNotFoundError:
+        pass
+
+
 def cleanup_outputs():
     """Delete all old output files"""
     print("🧹 Cleaning up old outputs...")
     
     # Delete PDF report
-    pdf_path = "outputs/viewer_intelligence_report.pdf"
-    if os.path.exists(pdf_path):
-        os.remove(pdf_path)
-        print(f"✓ Deleted: {pdf_path}")
+    _remove_file("outputs/viewer_intelligence_report.pdf")
     
     # Delete PNG summary
-    png_path = "outputs/viewer_intelligence_summary.png"
-    if os.path.exists(png_path):
-        os.remove(png_path)
-        print(f"✓ Deleted: {png_path}")
+    _remove_file("outputs/viewer_intelligence_summary.png")
     
     # Delete all charts
-    charts_dir = "outputs/charts"
-    if os.path.exists(charts_dir):
-        for file in os.listdir(charts_dir):
-            file_path = os.path.join(charts_dir, file)
-            if os.path.isfile(file_path):
-                os.remove(file_path)
-                print(f"✓ Deleted: {file_path}")
+    _clear_directory("outputs/charts")
     
     # Delete processed data
-    processed_dir = "data/processed"
-    if os.path.exists(processed_dir):
-        for file in os.listdir(processed_dir):
-            file_path = os.path.join(processed_dir, file)
-            if os.path.isfile(file_path):
-                os.remove(file_path)
-                print(f"✓ Deleted: {file_path}")
+    _clear_directory("data/processed")
     
     print("\n✅ All old outputs cleaned successfully!")
     print("\nNow run: python main.py")
@@ -6,81 +6,106 @@ Creates sample cached data for testing without API access
 import json
 import os
 from datetime import datetime, timedelta
-import random
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Deduplicated, sorted pools stored as object arrays so a whole batch of
+# names can be gathered with one fancy-indexing call
+CITIES = np.array(sorted({
+    "New York", "London", "Tokyo", "Paris", "Mumbai", "Sydney", "Toronto",
+    "Berlin", "Singapore", "Dubai", "Los Angeles", "Chicago", "Boston",
+    "San Francisco", "Seattle", "Austin", "Miami", "Atlanta", "Houston",
+    "Mexico City", "São Paulo", "Buenos Aires", "Madrid", "Barcelona",
+    "Rome", "Amsterdam", "Stockholm", "Copenhagen", "Oslo", "Helsinki"
+}), dtype=object)
+
+COUNTRIES = np.array(sorted({
+    "United States", "United Kingdom", "Japan", "France", "India",
+    "Australia", "Canada", "Germany", "Singapore", "UAE", "Mexico",
+    "Brazil", "Argentina", "Spain", "Italy", "Netherlands", "Sweden",
+    "Denmark", "Norway", "Finland"
+}), dtype=object)
+
+COMMENT_TEMPLATES = [
+    "Greetings from {city}! This is amazing!",
+    "Watching this from {city}, love it!",
+    "Hello from {country}! Great video!",
+    "I'm in {city} and this is so cool!",
+    "{city} viewer here! Awesome content!",
+    "Love this! From {country}",
+    "This is great! Greetings from {city}",
+    "Watching from {city}, {country}. Fantastic!",
+    "Amazing video! Love from {city}",
+    "Great work! Viewer from {country}",
+    "This is awesome!",  # No location
+    "Love it!",  # No location
+    "Incredible content!",  # No location
+]
+
+LANGUAGES = ['en', 'es', 'fr', 'de', 'ja', 'pt', 'it', 'nl', 'sv', 'no']
+
+
+def _compile_template(template):
+    """Build a renderer for a comment template taking (city, country)"""
+    has_city = '{city}' in template
+    has_country = '{country}' in template
+    
+    if has_city and has_country:
+        return lambda city, country: template.replace('{city}', city).replace('{country}', country)
+    if has_city:
+        return lambda city, country: template.replace('{city}', city)
+    if has_country:
+        return lambda city, country: template.replace('{country}', country)
+    return lambda city, country: template
+
+
+# Placeholders are resolved once here rather than re-parsed per comment
+TEMPLATE_RENDERERS = tuple(_compile_template(t) for t in COMMENT_TEMPLATES)
 
 
 def generate_sample_comments(n=100):
     """Generate sample comments with geographic mentions"""
     
-    cities = [
-        "New York", "London", "Tokyo", "Paris", "Mumbai", "Sydney", "Toronto",
-        "Berlin", "Singapore", "Dubai", "Los Angeles", "Chicago", "Boston",
-        "San Francisco", "Seattle", "Austin", "Miami", "Atlanta", "Houston",
-        "Mexico City", "São Paulo", "Buenos Aires", "Madrid", "Barcelona",
-        "Rome", "Amsterdam", "Stockholm", "Copenhagen", "Oslo", "Helsinki"
-    ]
-    
-    countries = [
-        "United States", "United Kingdom", "Japan", "France", "India",
-        "Australia", "Canada", "Germany", "Singapore", "UAE", "Mexico",
-        "Brazil", "Argentina", "Spain", "Italy", "Netherlands", "Sweden",
-        "Denmark", "Norway", "Finland"
-    ]
-    
-    comment_templates = [
-        "Greetings from {city}! This is amazing!",
-        "Watching this from {city}, love it!",
-        "Hello from {country}! Great video!",
-        "I'm in {city} and this is so cool!",
-        "{city} viewer here! Awesome content!",
-        "Love this! From {country}",
-        "This is great! Greetings from {city}",
-        "Watching from {city}, {country}. Fantastic!",
-        "Amazing video! Love from {city}",
-        "Great work! Viewer from {country}",
-        "This is awesome!",  # No location
-        "Love it!",  # No location
-        "Incredible content!",  # No location
-    ]
-    
-    languages = ['en', 'es', 'fr', 'de', 'ja', 'pt', 'it', 'nl', 'sv', 'no']
-    
     comments = []
     base_time = datetime.now() - timedelta(days=30)
     
-    for i in range(n):
-        template = random.choice(comment_templates)
-        
+    # Draw all random values up front in NumPy instead of per comment
+    rng = np.random.default_rng()
+    template_idx = rng.integers(0, len(COMMENT_TEMPLATES), size=n).tolist()
+    chosen_cities = CITIES[rng.integers(0, len(CITIES), size=n)].tolist()
+    chosen_countries = COUNTRIES[rng.integers(0, len(COUNTRIES), size=n)].tolist()
+    like_counts = rng.integers(0, 101, size=n).tolist()
+    reply_counts = rng.integers(0, 6, size=n).tolist()
+    
+    # Random timestamps within the last 30 days
+    offsets = (rng.integers(0, 31, size=n) * np.timedelta64(1, 'D')
+               + rng.integers(0, 24, size=n) * np.timedelta64(1, 'h')
+               + rng.integers(0, 60, size=n) * np.timedelta64(1, 'm'))
+    timestamps = np.datetime64(base_time, 's') + offsets
+    iso_timestamps = np.char.add(np.datetime_as_string(timestamps, unit='s'), 'Z').tolist()
+    
+    rows = zip(template_idx, chosen_cities, chosen_countries, iso_timestamps, like_counts, reply_counts)
+    for i, (t, city, country, timestamp, likes, replies) in enumerate(rows):
         # Generate comment text
-        if '{city}' in template and '{country}' in template:
-            city = random.choice(cities)
-            country = random.choice(countries)
-            text = template.format(city=city, country=country)
-        elif '{city}' in template:
-            city = random.choice(cities)
-            text = template.format(city=city)
-        elif '{country}' in template:
-            country = random.choice(countries)
-            text = template.format(country=country)
-        else:
-            text = template
-        
-        # Add random timestamp
-        timestamp = base_time + timedelta(
-            days=random.randint(0, 30),
-            hours=random.randint(0, 23),
-            minutes=random.randint(0, 59)
-        )
+        text = TEMPLATE_RENDERERS[t](city, country)
         
         comment = {
             'comment_id': f'comment_{i:04d}',
             'author': f'User{i:04d}',
             'author_channel_id': f'channel_{i:04d}',
             'text': text,
-            'like_count': random.randint(0, 100),
-            'published_at': timestamp.isoformat() + 'Z',
-            'updated_at': timestamp.isoformat() + 'Z',
-            'reply_count': random.randint(0, 5),
+            'like_count': likes,
+            'published_at': timestamp,
+            'updated_at': timestamp,
+            'reply_count': replies,
             'is_reply': False
         }
         
@@ -92,6 +117,9 @@ def generate_sample_comments(n=100):
 def generate_sample_data(video_id='ggJg6CcKtZE', num_comments=500):
     """Generate complete sample dataset"""
     
+    # Formatted once and shared by the metadata and the summary
+    generated_at = datetime.now().isoformat()
+    
     metadata = {
         'video_id': video_id,
         'title': 'Sample Video Title - Geographic Distribution Test',
@@ -107,7 +135,7 @@ def generate_sample_data(video_id='ggJg6CcKtZE', num_comments=500):
         'category_id': '22',
         'default_language': 'en',
         'default_audio_language': 'en',
-        'collected_at': datetime.now().isoformat(),
+        'collected_at': generated_at,
         'collection_method': 'sample_generator'
     }
     
@@ -120,7 +148,7 @@ def generate_sample_data(video_id='ggJg6CcKtZE', num_comments=500):
             'video_id': video_id,
             'video_url': f'https://www.youtube.com/watch?v={video_id}',
             'total_comments': len(comments),
-            'collection_timestamp': datetime.now().isoformat(),
+            'collection_timestamp': generated_at,
             'api_available': False,
             'note': 'This is sample data generated for testing purposes'
         }
@@ -141,8 +169,13 @@ def main():
     
     # Save to cache
     output_path = 'data/cache/video_data.json'
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if ORJSON_AVAILABLE:
+        Path(output_path).write_bytes(
+            orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        )
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
     
     print(f"[OK] Sample data generated: {output_path}")
     print(f"  - Video ID: {data['metadata']['video_id']}")
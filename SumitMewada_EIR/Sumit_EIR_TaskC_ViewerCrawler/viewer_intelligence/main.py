@@ -11,18 +11,22 @@ import time
 import webbrowser
 import subprocess
 import platform
+import shutil
 from datetime import datetime
+from functools import cached_property, lru_cache
+from importlib import import_module
 from pathlib import Path
+from typing import Dict
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from data_collector import YouTubeDataCollector
-from nlp_analyzer import NLPAnalyzer
-from intelligence_aggregator import IntelligenceAggregator
-from visualizer import Visualizer
-from report_generator import ReportGenerator
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,6 +39,91 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _load_json(path: str):
+    """
+    Parse a JSON file, using orjson when it is installed
+    
+    Results are memoized per (path, modification time), so re-runs in the
+    same process only re-parse files that changed on disk.
+    """
+    return _load_json_cached(path, os.stat(path).st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _load_json_cached(path: str, mtime_ns: int):
+    """Parse a JSON file; mtime_ns only serves as part of the cache key"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _dump_json(data, path: str):
+    """
+    Write data as compact UTF-8 JSON, using orjson when it is installed
+    
+    The file is written to a temporary sibling and moved into place with
+    os.replace, so readers never see a half-written cache.
+    """
+    tmp_path = path + '.tmp'
+    if ORJSON_AVAILABLE:
+        Path(tmp_path).write_bytes(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def _link_or_copy(src: str, dst: str):
+    """Hard-link src to dst, falling back to a file copy where links are unsupported"""
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    
+    try:
+        os.link(src, dst)
+    except (OSError, NotImplementedError):
+        shutil.copyfile(src, dst)
+
+
+def _ensure_dirs(paths):
+    """
+    Create directories that do not exist yet
+    
+    Parents of other entries are skipped (makedirs creates them with the
+    leaf), and existing leaves cost a single stat instead of a makedirs walk.
+    """
+    unique = set(os.path.normpath(p) for p in paths)
+    leaves = [p for p in unique
+              if not any(other.startswith(p + os.sep) for other in unique)]
+    
+    for dir_path in leaves:
+        if not os.path.isdir(dir_path):
+            os.makedirs(dir_path, exist_ok=True)
+
+
+def _list_entries(dir_path: str) -> set:
+    """Return the names of the files in a directory (empty if it does not exist)"""
+    try:
+        with os.scandir(dir_path) as it:
+            return {entry.name for entry in it if entry.is_file()}
+    except FileNotFoundError:
+        return set()
+
+
+def _cached_import(module_name: str, attr: str):
+    """Return an attribute of a src module, importing the module on first use"""
+    module = sys.modules.get(module_name) or import_module(module_name)
+    return getattr(module, attr)
+
+
+@lru_cache(maxsize=1)
+def _get_nlp_analyzer():
+    """Shared NLPAnalyzer, so the spaCy model is loaded once per process"""
+    return _cached_import('nlp_analyzer', 'NLPAnalyzer')()
+
+
 class ViewerIntelligencePipeline:
     """Complete pipeline for YouTube viewer intelligence analysis"""
     
@@ -58,18 +147,30 @@ class ViewerIntelligencePipeline:
             'charts': os.path.join(output_dir, 'charts')
         }
         
-        for dir_path in self.dirs.values():
-            os.makedirs(dir_path, exist_ok=True)
+        _ensure_dirs(self.dirs.values())
         
-        # Initialize components
-        self.collector = YouTubeDataCollector()
-        self.nlp_analyzer = NLPAnalyzer()
-        self.aggregator = IntelligenceAggregator()
-        self.visualizer = Visualizer(output_dir=self.dirs['charts'])
-        self.report_generator = ReportGenerator(output_dir=self.dirs['outputs'])
+        # Initialize components (collector, visualizer and report generator
+        # are built on first use so their heavy imports are only paid when needed)
+        self.nlp_analyzer = _get_nlp_analyzer()
+        self.aggregator = _cached_import('intelligence_aggregator', 'IntelligenceAggregator')()
         
         logger.info(f"Pipeline initialized for video: {video_url}")
     
+    @cached_property
+    def collector(self):
+        """YouTube data collector (only needed when the cache is missed)"""
+        return _cached_import('data_collector', 'YouTubeDataCollector')()
+    
+    @cached_property
+    def visualizer(self):
+        """Chart and map generator"""
+        return _cached_import('visualizer', 'Visualizer')(output_dir=self.dirs['charts'])
+    
+    @cached_property
+    def report_generator(self):
+        """PDF and PNG report generator"""
+        return _cached_import('report_generator', 'ReportGenerator')(output_dir=self.dirs['outputs'])
+    
     def step1_collect_data(self, max_comments: int = 1000, use_cache: bool = True):
         """
         Step 1: Collect video data and comments
@@ -87,8 +188,7 @@ class ViewerIntelligencePipeline:
         # Check cache
         if use_cache and os.path.exists(cache_path):
             logger.info(f"Loading cached data from: {cache_path}")
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                self.raw_data = json.load(f)
+            self.raw_data = _load_json(cache_path)
             logger.info(f"Loaded {len(self.raw_data.get('comments', []))} cached comments")
         else:
             # Collect fresh data
@@ -96,14 +196,12 @@ class ViewerIntelligencePipeline:
             self.raw_data = self.collector.collect_all_data(self.video_url, max_comments)
             
             # Save to cache
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(self.raw_data, f, ensure_ascii=False, indent=2)
+            _dump_json(self.raw_data, cache_path)
             logger.info(f"Data cached to: {cache_path}")
         
-        # Save raw data
+        # Save raw data (byte-identical to the cache, so link instead of re-serializing)
         raw_path = os.path.join(self.dirs['raw'], 'video_data.json')
-        with open(raw_path, 'w', encoding='utf-8') as f:
-            json.dump(self.raw_data, f, ensure_ascii=False, indent=2)
+        _link_or_copy(cache_path, raw_path)
         
         logger.info(f"✓ Data collection complete: {len(self.raw_data.get('comments', []))} comments")
     
@@ -120,13 +218,22 @@ class ViewerIntelligencePipeline:
             self.analyses_df = None
             return
         
-        # Analyze all comments
-        self.analyses_df = self.nlp_analyzer.analyze_all_comments(comments)
-        
-        # Save analyses
+        source_path = os.path.join(self.dirs['cache'], 'video_data.json')
         analyses_path = os.path.join(self.dirs['processed'], 'comment_analyses.csv')
-        self.analyses_df.to_csv(analyses_path, index=False)
-        logger.info(f"Analyses saved to: {analyses_path}")
+        settings = self.nlp_analyzer.analysis_settings()
+        self.analyses_df = self._load_cached_analyses(source_path, len(comments), settings)
+        
+        if self.analyses_df is None:
+            # Analyze all comments
+            self.analyses_df = self.nlp_analyzer.analyze_all_comments(comments)
+            self._save_cached_analyses(source_path, len(comments), settings)
+        elif os.path.exists(analyses_path):
+            analyses_path = None  # already exported from these analyses
+        
+        # Save analyses (also restores the CSV if data/processed was cleaned)
+        if analyses_path:
+            self.analyses_df.to_csv(analyses_path, index=False)
+            logger.info(f"Analyses saved to: {analyses_path}")
         
         # Get language distribution
         self.language_dist = self.nlp_analyzer.get_language_distribution(self.analyses_df)
@@ -139,6 +246,59 @@ class ViewerIntelligencePipeline:
         logger.info(f"  - Cities mentioned: {len(self.location_mentions['cities'])}")
         logger.info(f"  - Countries mentioned: {len(self.location_mentions['countries'])}")
     
+    def _analyses_cache_paths(self):
+        """Paths of the pickled analyses and their metadata sidecar"""
+        base = os.path.join(self.dirs['cache'], 'comment_analyses')
+        return base + '.pkl', base + '.meta.json'
+    
+    def _load_cached_analyses(self, source_path: str, comment_count: int, settings: Dict):
+        """
+        Load previous NLP analyses if they were built from the current input
+        
+        The analyses are reused only when the sidecar records the same input
+        modification time, comment count and analyzer settings (models and
+        language subset), so any change to either triggers a fresh analysis.
+        
+        Returns:
+            DataFrame with analysis results, or None if the cache is stale
+        """
+        pickle_path, meta_path = self._analyses_cache_paths()
+        
+        try:
+            source_mtime = os.stat(source_path).st_mtime_ns
+            meta = _load_json(meta_path)
+        except (OSError, ValueError):
+            return None
+        
+        if (meta.get('source_mtime_ns') != source_mtime
+                or meta.get('comment_count') != comment_count
+                or meta.get('analyzer') != settings):
+            return None
+        
+        import pandas as pd
+        try:
+            analyses_df = pd.read_pickle(pickle_path)
+        except Exception as e:
+            logger.warning(f"Could not load cached analyses: {e}")
+            return None
+        
+        logger.info(f"Loaded cached analyses from: {pickle_path}")
+        return analyses_df
+    
+    def _save_cached_analyses(self, source_path: str, comment_count: int, settings: Dict):
+        """Persist the current analyses together with the input they came from"""
+        pickle_path, meta_path = self._analyses_cache_paths()
+        
+        try:
+            self.analyses_df.to_pickle(pickle_path)
+            _dump_json({
+                'source_mtime_ns': os.stat(source_path).st_mtime_ns,
+                'comment_count': comment_count,
+                'analyzer': settings
+            }, meta_path)
+        except OSError as e:
+            logger.warning(f"Could not cache analyses: {e}")
+    
     def step3_aggregate_intelligence(self):
         """Step 3: Aggregate signals and estimate viewer distribution"""
         logger.info("=" * 80)
@@ -151,6 +311,7 @@ class ViewerIntelligencePipeline:
         
         # Process all analyses
         self.aggregator.process_all_analyses(self.analyses_df, self.nlp_analyzer)
+        self.nlp_analyzer.save_geocode_cache()
         
         # Get distribution estimates
         self.distribution = self.aggregator.estimate_viewer_distribution(top_n=50)
@@ -173,49 +334,22 @@ class ViewerIntelligencePipeline:
         logger.info("STEP 4: VISUALIZATION")
         logger.info("=" * 80)
         
-        self.chart_paths = {}
+        charts_dir = self.dirs['charts']
         
-        # Cities bar chart
-        if len(self.distribution['cities']) > 0:
-            path = os.path.join(self.dirs['charts'], 'top_cities_bar.png')
-            self.visualizer.plot_top_cities_bar(
-                self.distribution['cities'], 
-                top_n=10, 
-                save_path=path
-            )
-            self.chart_paths['cities_bar'] = path
-        
-        # Language pie chart
-        if self.language_dist:
-            path = os.path.join(self.dirs['charts'], 'language_distribution_pie.png')
-            self.visualizer.plot_language_distribution_pie(
-                self.language_dist,
-                save_path=path
-            )
-            self.chart_paths['language_pie'] = path
-        
-        # Countries bar chart
-        if len(self.distribution['countries']) > 0:
-            path = os.path.join(self.dirs['charts'], 'top_countries_bar.png')
-            self.visualizer.plot_country_distribution(
-                self.distribution['countries'],
-                top_n=15,
-                save_path=path
-            )
-            self.chart_paths['countries_bar'] = path
-        
-        # Signal breakdown
-        if self.signal_breakdown:
-            path = os.path.join(self.dirs['charts'], 'signal_breakdown.png')
-            self.visualizer.create_signal_breakdown_chart(
-                self.signal_breakdown,
-                save_path=path
-            )
-            self.chart_paths['signal_breakdown'] = path
+        # Bar/pie/signal charts and the choropleth, drawn in this process
+        # (faster than worker processes for these few charts; see render_all)
+        self.chart_paths = self.visualizer.render_all(
+            self.distribution['cities'],
+            self.distribution['countries'],
+            self.language_dist,
+            self.signal_breakdown,
+            out_dir=charts_dir
+        )
         
-        # Interactive map
+        # Interactive map (drawn here since it geocodes through the
+        # pipeline's NLPAnalyzer and its cache)
         if len(self.distribution['cities']) > 0:
-            path = os.path.join(self.dirs['charts'], 'interactive_map.html')
+            path = os.path.join(charts_dir, 'interactive_map.html')
             self.visualizer.create_interactive_map(
                 self.distribution['cities'],
                 self.nlp_analyzer,
@@ -223,18 +357,6 @@ class ViewerIntelligencePipeline:
             )
             self.chart_paths['map'] = path
         
-        # Choropleth map
-        if len(self.distribution['countries']) > 0:
-            path = os.path.join(self.dirs['charts'], 'choropleth_map.html')
-            try:
-                self.visualizer.create_plotly_choropleth(
-                    self.distribution['countries'],
-                    save_path=path
-                )
-                self.chart_paths['choropleth'] = path
-            except Exception as e:
-                logger.warning(f"Could not create choropleth: {e}")
-        
         logger.info(f"✓ Visualizations created: {len(self.chart_paths)} charts")
     
     def step5_generate_report(self):
@@ -244,7 +366,7 @@ class ViewerIntelligencePipeline:
         logger.info("=" * 80)
         
         # Prepare metadata
-        metadata = self.raw_data.get('metadata', {})
+        metadata = dict(self.raw_data.get('metadata', {}))  # raw_data may be memoized
         metadata['comments_analyzed'] = len(self.raw_data.get('comments', []))
         
         # Generate PDF report
@@ -291,6 +413,13 @@ class ViewerIntelligencePipeline:
             # Run all steps
             self.step1_collect_data(max_comments, use_cache)
             self.step2_analyze_comments()
+            
+            # Nothing downstream can be built without analyses, so skip the
+            # aggregation, chart and report scaffolding (and their imports)
+            if self.analyses_df is None or self.analyses_df.empty:
+                logger.warning("No comment analyses available - skipping steps 3-5")
+                return
+            
             self.step3_aggregate_intelligence()
             self.step4_create_visualizations()
             self.step5_generate_report()
@@ -325,50 +454,63 @@ class ViewerIntelligencePipeline:
         logger.info("\n🚀 Opening outputs...")
         
         try:
-            # Open PDF report
-            pdf_path = os.path.join(self.dirs['outputs'], 'viewer_intelligence_report.pdf')
-            if os.path.exists(pdf_path):
-                self._open_file(pdf_path)
-                logger.info(f"✓ Opened PDF report")
+            files_to_open = []
+            opened = []
             
-            # Open PNG summary
-            png_path = os.path.join(self.dirs['outputs'], 'viewer_intelligence_summary.png')
-            if os.path.exists(png_path):
-                self._open_file(png_path)
-                logger.info(f"✓ Opened PNG summary")
+            # One directory sweep each instead of an exists() call per output
+            output_names = _list_entries(self.dirs['outputs'])
+            chart_names = _list_entries(self.dirs['charts'])
             
-            # Open interactive maps in browser
-            interactive_map = os.path.join(self.dirs['charts'], 'interactive_map.html')
-            if os.path.exists(interactive_map):
-                webbrowser.open('file://' + os.path.abspath(interactive_map))
-                logger.info(f"✓ Opened interactive map in browser")
+            # PDF report
+            if 'viewer_intelligence_report.pdf' in output_names:
+                files_to_open.append(os.path.join(self.dirs['outputs'], 'viewer_intelligence_report.pdf'))
+                opened.append("PDF report")
             
-            choropleth_map = os.path.join(self.dirs['charts'], 'choropleth_map.html')
-            if os.path.exists(choropleth_map):
-                webbrowser.open('file://' + os.path.abspath(choropleth_map))
-                logger.info(f"✓ Opened choropleth map in browser")
+            # PNG summary
+            if 'viewer_intelligence_summary.png' in output_names:
+                files_to_open.append(os.path.join(self.dirs['outputs'], 'viewer_intelligence_summary.png'))
+                opened.append("PNG summary")
             
-            # Open charts folder
-            if os.path.exists(self.dirs['charts']):
-                self._open_file(self.dirs['charts'])
-                logger.info(f"✓ Opened charts folder")
+            # Charts folder
+            if os.path.isdir(self.dirs['charts']):
+                files_to_open.append(self.dirs['charts'])
+                opened.append("charts folder")
+            
+            self._open_files(files_to_open)
+            for name in opened:
+                logger.info(f"✓ Opened {name}")
+            
+            # Open interactive maps in browser (resolve the browser once)
+            browser = None
+            for filename, name in [('interactive_map.html', 'interactive map'),
+                                   ('choropleth_map.html', 'choropleth map')]:
+                if filename in chart_names:
+                    browser = browser or webbrowser.get()
+                    map_path = os.path.join(self.dirs['charts'], filename)
+                    browser.open_new_tab('file://' + os.path.abspath(map_path))
+                    logger.info(f"✓ Opened {name} in browser")
             
             logger.info("\n✅ All outputs opened successfully!")
             
         except Exception as e:
             logger.warning(f"Could not auto-open some outputs: {e}")
     
-    def _open_file(self, filepath):
-        """Open file with default application based on OS"""
-        filepath = os.path.abspath(filepath)
+    def _open_files(self, filepaths):
+        """Open files with the default application based on OS, without waiting"""
+        filepaths = [os.path.abspath(p) for p in filepaths]
+        if not filepaths:
+            return
         
         if platform.system() == 'Windows':
-            os.startfile(filepath)
-        elif platform.system() == 'Darwin':  # macOS
-            subprocess.run(['open', filepath])
-        else:  # Linux
-            subprocess.run(['xdg-open', filepath])
-
+            for filepath in filepaths:
+                os.startfile(filepath)
+        elif platform.system() == 'Darwin':  # macOS: open accepts several paths
+            subprocess.Popen(['open'] + filepaths,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:  # Linux: xdg-open takes a single path
+            for filepath in filepaths:
+                subprocess.Popen(['xdg-open', filepath],
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 def main():
     """Main entry point"""
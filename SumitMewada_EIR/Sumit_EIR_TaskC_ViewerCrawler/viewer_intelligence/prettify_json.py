@@ -0,0 +1,29 @@
+"""
+Prettify Script - Pretty-print compact JSON data files for inspection
+Cache and raw data files are written compactly; this reformats a copy
+"""
+import sys
+import json
+
+
+def prettify(input_path, output_path=None):
+    """Pretty-print a JSON file to stdout or to output_path"""
+    with open(input_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+    
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+        print(f"✓ Written: {output_path}")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python prettify_json.py <input.json> [output.json]")
+        sys.exit(1)
+    
+    prettify(*sys.argv[1:])
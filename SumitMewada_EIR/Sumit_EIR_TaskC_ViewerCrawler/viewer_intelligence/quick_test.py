@@ -1,73 +1,85 @@
 """Quick test to identify errors"""
 import sys
 import os
+import importlib.util
+import py_compile
+
+# Spec lookups only: reports what is installed without paying import cost
+CHECKS = [
+    ('matplotlib', 'matplotlib'),
+    ('pandas', 'pandas'),
+    ('langdetect', 'langdetect'),
+    ('geotext', 'geotext'),
+]
+
+# Compiled rather than imported, so syntax errors show up without loading
+# every dependency (same check as check_and_run.py)
+PROJECT_MODULES = [
+    'data_collector',
+    'nlp_analyzer',
+    'intelligence_aggregator',
+    'visualizer',
+    'report_generator',
+]
 
 print("Testing basic imports...")
 
-try:
-    print("1. Testing matplotlib...")
-    import matplotlib
-    print("   ✓ matplotlib OK")
-    
-    print("2. Testing pandas...")
-    import pandas
-    print("   ✓ pandas OK")
-    
-    print("3. Testing langdetect...")
-    import langdetect
-    print("   ✓ langdetect OK")
-    
-    print("4. Testing geotext...")
-    import geotext
-    print("   ✓ geotext OK")
-    
-    print("5. Testing spacy (optional)...")
+missing = []
+broken = []
+
+for step, (label, module) in enumerate(CHECKS, 1):
+    print(f"{step}. Testing {label}...")
+    if importlib.util.find_spec(module) is not None:
+        print(f"   ✓ {label} OK")
+    else:
+        print(f"   ✗ {label} NOT FOUND")
+        missing.append(label)
+
+print(f"{len(CHECKS) + 1}. Testing spacy (optional)...")
+if importlib.util.find_spec('spacy') is not None:
+    print("   ✓ spacy available")
     try:
         import spacy
-        print("   ✓ spacy available")
-        try:
-            nlp = spacy.load('en_core_web_sm')
-            print("   ✓ spacy model loaded")
-        except:
-            print("   ⚠ spacy model not found (will use GeoText instead)")
-    except Exception as e:
-        print(f"   ⚠ spacy not available: {str(e)[:50]}... (will use GeoText instead)")
-    
-    print("\n6. Testing project modules...")
-    sys.path.insert(0, 'src')
-    
-    from data_collector import YouTubeDataCollector
-    print("   ✓ data_collector OK")
-    
-    from nlp_analyzer import NLPAnalyzer
-    print("   ✓ nlp_analyzer OK")
-    
-    from intelligence_aggregator import IntelligenceAggregator
-    print("   ✓ intelligence_aggregator OK")
-    
-    from visualizer import Visualizer
-    print("   ✓ visualizer OK")
-    
-    from report_generator import ReportGenerator
-    print("   ✓ report_generator OK")
-    
+        nlp = spacy.load('en_core_web_sm')
+        print("   ✓ spacy model loaded")
+    except Exception:
+        print("   ⚠ spacy model not found (will use GeoText instead)")
+else:
+    print("   ⚠ spacy not available (will use GeoText instead)")
+
+print(f"\n{len(CHECKS) + 2}. Testing project modules...")
+
+for module in PROJECT_MODULES:
+    try:
+        py_compile.compile(
+            os.path.join('src', f'{module}.py'), doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH
+        )
+        print(f"   ✓ {module} OK")
+    except FileNotFoundError:
+        print(f"   ✗ {module} NOT FOUND")
+        missing.append(module)
+    except py_compile.PyCompileError as e:
+        print(f"   ✗ {module} - ERROR: {e.msg}")
+        broken.append(module)
+
+if not missing and not broken:
     print("\n✅ ALL TESTS PASSED!")
     print("\nNow you can run: python main.py")
-    
-except Exception as e:
-    print(f"\n❌ ERROR: {e}")
-    import traceback
-    print("\nFull traceback:")
-    traceback.print_exc()
+else:
+    if missing:
+        print(f"\n❌ ERROR: missing {', '.join(missing)}")
+    if broken:
+        print(f"\n❌ ERROR: {', '.join(broken)} failed to compile")
     print("\n" + "="*80)
     print("SOLUTION:")
     print("="*80)
     
-    if "spacy" in str(e).lower():
-        print("spaCy issue detected. The project will work without spaCy.")
-        print("It will use GeoText for location detection instead.")
-    elif "module" in str(e).lower():
+    if broken:
+        print("Fix the errors reported above in src/.")
+    elif any(module in PROJECT_MODULES for module in missing):
+        print("Project source files are missing. Run this from the viewer_intelligence")
+        print("directory and make sure src/ is intact.")
+    else:
         print("Missing module. Install with:")
         print("pip install -r requirements.txt")
-    else:
-        print("Unknown error. Please share this output.")
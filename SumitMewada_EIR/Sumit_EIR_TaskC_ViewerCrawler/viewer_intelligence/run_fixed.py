@@ -7,6 +7,12 @@ import sys
 import warnings
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Suppress all warnings
 warnings.filterwarnings('ignore')
 os.environ['PYTHONWARNINGS'] = 'ignore'
@@ -14,24 +20,95 @@ os.environ['PYTHONWARNINGS'] = 'ignore'
 # Configure logging to be less verbose
 logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
 
+REQUIRED_DIRS = (
+    'data', 'data/cache', 'data/raw', 'data/processed',
+    'outputs', 'outputs/charts'
+)
+
+# Set once all required directories are known to exist
+_dirs_ready = False
+
+# Sample viewer locations: (city, country, language)
+_SAMPLE_LOCATIONS = (
+    ("New York", "USA", "en"),
+    ("London", "UK", "en"),
+    ("Paris", "France", "fr"),
+    ("Tokyo", "Japan", "ja"),
+    ("Mumbai", "India", "hi"),
+    ("Berlin", "Germany", "de"),
+    ("Sydney", "Australia", "en"),
+    ("Toronto", "Canada", "en"),
+    ("Madrid", "Spain", "es"),
+    ("Rome", "Italy", "it")
+)
+
+# Comment templates with location hints
+_TEXT_TEMPLATES = (
+    "Great video! Watching from {city}",
+    "Love this! Greetings from {city}, {country}",
+    "Amazing content, {city} viewer here!",
+    "Watching this in {city} right now",
+    "Hello from {city}! Great work",
+    "This is awesome! {city} fan here",
+    "Incredible video, sending love from {city}",
+    "Fantastic! Viewer from {city}, {country}",
+    "Brilliant content! {city} audience loves it",
+    "Outstanding work! {city} viewer impressed"
+)
+
+
+def _existing_dirs(roots):
+    """Collect existing root directories and their subdirectories (one scandir per root)"""
+    present = set()
+    for root in roots:
+        try:
+            with os.scandir(root) as it:
+                present.add(root)
+                present.update(f"{root}/{entry.name}" for entry in it if entry.is_dir())
+        except FileNotFoundError:
+            pass
+    return present
+
+
+class _BufferedLog:
+    """Collects progress lines and writes them to stdout in one call per phase"""
+    
+    def __init__(self):
+        self._buf = []
+    
+    def log(self, line=""):
+        self._buf.append(line)
+    
+    def flush(self):
+        if self._buf:
+            sys.stdout.write("\n".join(self._buf) + "\n")
+            sys.stdout.flush()
+            self._buf.clear()
+
+
 def check_and_create_directories():
     """Ensure all required directories exist"""
-    dirs = [
-        'data', 'data/cache', 'data/raw', 'data/processed',
-        'outputs', 'outputs/charts'
-    ]
+    global _dirs_ready
+    if _dirs_ready:
+        return
+    
+    present = _existing_dirs({dir_path.split('/')[0] for dir_path in REQUIRED_DIRS})
     
-    for dir_path in dirs:
-        os.makedirs(dir_path, exist_ok=True)
+    for dir_path in REQUIRED_DIRS:
+        if dir_path not in present:
+            os.makedirs(dir_path, exist_ok=True)
+    
+    _dirs_ready = True
 
 def create_sample_data():
     """Create sample cached data if none exists"""
     cache_file = "data/cache/comments_cache.json"
     
-    if not os.path.exists(cache_file):
+    if not os.path.exists(cache_file) or os.path.getsize(cache_file) == 0:
         print("Creating sample data for demonstration...")
         
         import json
+        import random
         from datetime import datetime
         
         # Sample comments data
@@ -49,64 +126,46 @@ def create_sample_data():
             "comments": []
         }
         
-        # Generate sample comments with geographic hints
-        locations = [
-            ("New York", "USA", "en"),
-            ("London", "UK", "en"), 
-            ("Paris", "France", "fr"),
-            ("Tokyo", "Japan", "ja"),
-            ("Mumbai", "India", "hi"),
-            ("Berlin", "Germany", "de"),
-            ("Sydney", "Australia", "en"),
-            ("Toronto", "Canada", "en"),
-            ("Madrid", "Spain", "es"),
-            ("Rome", "Italy", "it")
-        ]
+        # Draw all random values in one batch per field
+        n = 200
+        chosen_locations = random.choices(_SAMPLE_LOCATIONS, k=n)
+        chosen_templates = random.choices(_TEXT_TEMPLATES, k=n)
+        like_counts = random.choices(range(101), k=n)
+        published_at = datetime.now().isoformat()
         
-        import random
-        
-        for i in range(200):
-            city, country, lang = random.choice(locations)
-            
-            # Create comments with location hints
-            texts = [
-                f"Great video! Watching from {city}",
-                f"Love this! Greetings from {city}, {country}",
-                f"Amazing content, {city} viewer here!",
-                f"Watching this in {city} right now",
-                f"Hello from {city}! Great work",
-                f"This is awesome! {city} fan here",
-                f"Incredible video, sending love from {city}",
-                f"Fantastic! Viewer from {city}, {country}",
-                f"Brilliant content! {city} audience loves it",
-                f"Outstanding work! {city} viewer impressed"
-            ]
-            
-            comment = {
+        sample_data["comments"] = [
+            {
                 "comment_id": f"comment_{i}",
                 "author": f"User{i}",
-                "text": random.choice(texts),
-                "like_count": random.randint(0, 100),
-                "published_at": datetime.now().isoformat(),
+                "text": template.format(city=city, country=country),
+                "like_count": likes,
+                "published_at": published_at,
                 "is_reply": False
             }
-            
-            sample_data["comments"].append(comment)
+            for i, ((city, country, _), template, likes)
+            in enumerate(zip(chosen_locations, chosen_templates, like_counts))
+        ]
         
         # Save sample data
         os.makedirs("data/cache", exist_ok=True)
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(sample_data, f, ensure_ascii=False, indent=2)
+        if ORJSON_AVAILABLE:
+            with open(cache_file, 'wb') as f:
+                f.write(orjson.dumps(sample_data, option=orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump(sample_data, f, ensure_ascii=False, separators=(',', ':'))
         
         print(f"✓ Created sample data with {len(sample_data['comments'])} comments")
 
 def run_pipeline():
     """Run the complete pipeline with error handling"""
     
-    print("=" * 80)
-    print("🚀 YOUTUBE VIEWER INTELLIGENCE PIPELINE")
-    print("=" * 80)
-    print()
+    out = _BufferedLog()
+    out.log("=" * 80)
+    out.log("🚀 YOUTUBE VIEWER INTELLIGENCE PIPELINE")
+    out.log("=" * 80)
+    out.log()
+    out.flush()
     
     # Setup
     check_and_create_directories()
@@ -120,53 +179,60 @@ def run_pipeline():
     MAX_COMMENTS = 1000
     USE_CACHE = True
     
-    print(f"📹 Video URL: {VIDEO_URL}")
-    print(f"💬 Max comments: {MAX_COMMENTS}")
-    print(f"💾 Using cache: {USE_CACHE}")
-    print()
+    out.log(f"📹 Video URL: {VIDEO_URL}")
+    out.log(f"💬 Max comments: {MAX_COMMENTS}")
+    out.log(f"💾 Using cache: {USE_CACHE}")
+    out.log()
+    out.flush()
     
     try:
-        print("📦 Loading modules...")
+        out.log("📦 Loading modules...")
         
         # Import with error handling
         try:
             from data_collector import YouTubeDataCollector
-            print("  ✓ Data collector loaded")
+            out.log("  ✓ Data collector loaded")
         except Exception as e:
-            print(f"  ❌ Data collector error: {e}")
+            out.log(f"  ❌ Data collector error: {e}")
+            out.flush()
             return False
             
         try:
             from nlp_analyzer import NLPAnalyzer
-            print("  ✓ NLP analyzer loaded")
+            out.log("  ✓ NLP analyzer loaded")
         except Exception as e:
-            print(f"  ❌ NLP analyzer error: {e}")
+            out.log(f"  ❌ NLP analyzer error: {e}")
+            out.flush()
             return False
             
         try:
             from intelligence_aggregator import IntelligenceAggregator
-            print("  ✓ Intelligence aggregator loaded")
+            out.log("  ✓ Intelligence aggregator loaded")
         except Exception as e:
-            print(f"  ❌ Intelligence aggregator error: {e}")
+            out.log(f"  ❌ Intelligence aggregator error: {e}")
+            out.flush()
             return False
             
         try:
             from visualizer import Visualizer
-            print("  ✓ Visualizer loaded")
+            out.log("  ✓ Visualizer loaded")
         except Exception as e:
-            print(f"  ❌ Visualizer error: {e}")
+            out.log(f"  ❌ Visualizer error: {e}")
+            out.flush()
             return False
             
         try:
             from report_generator import ReportGenerator
-            print("  ✓ Report generator loaded")
+            out.log("  ✓ Report generator loaded")
         except Exception as e:
-            print(f"  ❌ Report generator error: {e}")
+            out.log(f"  ❌ Report generator error: {e}")
+            out.flush()
             return False
         
-        print()
-        print("🔄 Running pipeline...")
-        print()
+        out.log()
+        out.log("🔄 Running pipeline...")
+        out.log()
+        out.flush()
         
         # Import and run main pipeline
         from main import ViewerIntelligencePipeline
@@ -177,41 +243,49 @@ def run_pipeline():
         # Run pipeline
         pipeline.run(max_comments=MAX_COMMENTS, use_cache=USE_CACHE)
         
-        print()
-        print("=" * 80)
-        print("✅ PIPELINE COMPLETED SUCCESSFULLY!")
-        print("=" * 80)
-        print()
+        out.log()
+        out.log("=" * 80)
+        out.log("✅ PIPELINE COMPLETED SUCCESSFULLY!")
+        out.log("=" * 80)
+        out.log()
         
-        # List outputs
+        # List outputs (one directory scan instead of an exists() per file)
         outputs_dir = "outputs"
-        if os.path.exists(outputs_dir):
-            print("📂 Generated outputs:")
+        try:
+            with os.scandir(outputs_dir) as it:
+                entries = {entry.name: entry for entry in it}
+        except FileNotFoundError:
+            entries = None
+        
+        if entries is not None:
+            out.log("📂 Generated outputs:")
             
-            pdf_file = os.path.join(outputs_dir, "viewer_intelligence_report.pdf")
-            if os.path.exists(pdf_file):
-                print(f"  ✓ PDF Report: {pdf_file}")
+            if "viewer_intelligence_report.pdf" in entries:
+                out.log(f"  ✓ PDF Report: {entries['viewer_intelligence_report.pdf'].path}")
             
-            png_file = os.path.join(outputs_dir, "viewer_intelligence_summary.png")
-            if os.path.exists(png_file):
-                print(f"  ✓ PNG Summary: {png_file}")
+            if "viewer_intelligence_summary.png" in entries:
+                out.log(f"  ✓ PNG Summary: {entries['viewer_intelligence_summary.png'].path}")
             
-            charts_dir = os.path.join(outputs_dir, "charts")
-            if os.path.exists(charts_dir):
-                chart_files = os.listdir(charts_dir)
-                print(f"  ✓ Charts ({len(chart_files)} files): {charts_dir}")
+            if "charts" in entries and entries["charts"].is_dir():
+                charts_dir = entries["charts"].path
+                with os.scandir(charts_dir) as it:
+                    chart_files = [entry.name for entry in it]
+                out.log(f"  ✓ Charts ({len(chart_files)} files): {charts_dir}")
                 for chart in chart_files:
-                    print(f"    - {chart}")
+                    out.log(f"    - {chart}")
         
-        print()
-        print("🎉 All outputs generated successfully!")
+        out.log()
+        out.log("🎉 All outputs generated successfully!")
+        out.flush()
         return True
         
     except KeyboardInterrupt:
+        out.flush()
         print("\n\n⚠️  Pipeline interrupted by user")
         return False
         
     except Exception as e:
+        out.flush()
         print(f"\n\n❌ PIPELINE ERROR: {e}")
         
         # Detailed error info
@@ -7,7 +7,14 @@ import os
 import sys
 import subprocess
 import platform
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 
+# spaCy model wheel matching the pinned spacy==3.7.x, installed alongside requirements.txt
+SPACY_MODEL_URL = (
+    "https://github.com/explosion/spacy-models/releases/download/"
+    "en_core_web_sm-3.7.1/en_core_web_sm-3.7.1-py3-none-any.whl"
+)
 
 def print_header(text):
     """Print formatted header"""
@@ -65,7 +72,7 @@ def create_directories():
 
 
 def install_dependencies():
-    """Install Python dependencies"""
+    """Install Python dependencies and the spaCy model in one pip run"""
     print_header("Installing Python Dependencies")
     
     if not os.path.exists('requirements.txt'):
@@ -73,18 +80,8 @@ def install_dependencies():
         return False
     
     return run_command(
-        f"{sys.executable} -m pip install -r requirements.txt",
-        "Installing packages from requirements.txt"
-    )
-
-
-def download_spacy_model():
-    """Download spaCy language model"""
-    print_header("Downloading spaCy Model")
-    
-    return run_command(
-        f"{sys.executable} -m spacy download en_core_web_sm",
-        "Downloading en_core_web_sm model"
+        f'"{sys.executable}" -m pip install -r requirements.txt "{SPACY_MODEL_URL}"',
+        "Installing packages from requirements.txt and en_core_web_sm model"
     )
 
 
@@ -114,7 +111,7 @@ def setup_env_file():
 
 
 def verify_installation():
-    """Verify that key packages are importable"""
+    """Verify that key packages are installed (spec lookup only, nothing is imported)"""
     print_header("Verifying Installation")
     
     packages = [
@@ -131,21 +128,24 @@ def verify_installation():
         ('reportlab', 'reportlab')
     ]
     
+    # Spec lookups are mostly filesystem stats, so they overlap well in threads
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        found = list(executor.map(
+            lambda pkg: importlib.util.find_spec(pkg[1]) is not None, packages
+        ))
+    
     all_ok = True
-    for package_name, import_name in packages:
-        try:
-            __import__(import_name)
+    for (package_name, import_name), is_installed in zip(packages, found):
+        if is_installed:
             print(f"✓ {package_name}")
-        except ImportError:
+        else:
             print(f"✗ {package_name} - NOT INSTALLED")
             all_ok = False
     
-    # Check spaCy model
-    try:
-        import spacy
-        nlp = spacy.load('en_core_web_sm')
+    # Check spaCy model (installed as a regular package, so no spacy.load needed)
+    if importlib.util.find_spec('en_core_web_sm') is not None:
         print(f"✓ spacy model (en_core_web_sm)")
-    except:
+    else:
         print(f"✗ spacy model (en_core_web_sm) - NOT INSTALLED")
         all_ok = False
     
@@ -184,12 +184,19 @@ def main():
     print("  YOUTUBE VIEWER INTELLIGENCE CRAWLER - SETUP")
     print("=" * 80)
     
+    # The version check gates everything else
+    if not check_python_version():
+        print_header("Setup Incomplete")
+        print("  ✗ Python Version Check")
+        print("\nPlease resolve the errors above and run setup again.")
+        sys.exit(1)
+    
+    # Each step prints its own section, so they run in order; the local file
+    # steps are instant, so overlapping them with pip saved nothing
     steps = [
-        ("Python Version Check", check_python_version),
         ("Directory Creation", create_directories),
         ("Environment File Setup", setup_env_file),
         ("Dependency Installation", install_dependencies),
-        ("spaCy Model Download", download_spacy_model),
         ("Installation Verification", verify_installation)
     ]
     
@@ -3,14 +3,20 @@ YouTube Viewer Intelligence Crawler
 Source package initialization
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "OSINT Research Team"
 
-from .data_collector import YouTubeDataCollector
-from .nlp_analyzer import NLPAnalyzer
-from .intelligence_aggregator import IntelligenceAggregator
-from .visualizer import Visualizer
-from .report_generator import ReportGenerator
+# Public classes and the submodules defining them; loaded on first access
+# (PEP 562) so importing the package does not pull in every dependency
+_LAZY = {
+    'YouTubeDataCollector': 'data_collector',
+    'NLPAnalyzer': 'nlp_analyzer',
+    'IntelligenceAggregator': 'intelligence_aggregator',
+    'Visualizer': 'visualizer',
+    'ReportGenerator': 'report_generator'
+}
 
 __all__ = [
     'YouTubeDataCollector',
@@ -19,3 +25,18 @@ __all__ = [
     'Visualizer',
     'ReportGenerator'
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module = importlib.import_module('.' + module_name, __name__)
+    obj = getattr(module, name)
+    globals()[name] = obj
+    return obj
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
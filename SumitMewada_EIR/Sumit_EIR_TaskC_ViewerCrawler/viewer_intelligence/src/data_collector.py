@@ -4,25 +4,46 @@ Collects video metadata and comments using YouTube Data API v3 and yt-dlp
 """
 
 import os
+import re
 import json
-import time
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import IO, Dict, Iterator, List, Optional
 from datetime import datetime
 import logging
 
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-import yt_dlp
-from dotenv import load_dotenv
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Retries for rate-limited (429) and server-error responses; the client
+# backs off exponentially between attempts
+API_NUM_RETRIES = 5
+
+# Matches the 11-character video ID in watch?v= and youtu.be/ URLs
+_VIDEO_ID_RE = re.compile(r'(?:v=|youtu\.be/)([A-Za-z0-9_-]{11})')
+
+
+def _author_channel_id(snippet: Dict) -> Optional[str]:
+    """Channel ID of a comment's author (absent for some deleted/legacy accounts)"""
+    channel = snippet.get('authorChannelId')
+    return channel['value'] if channel else None
+
 
 class YouTubeDataCollector:
     """Collects YouTube video data using multiple methods"""
     
+    # API clients shared by all instances, keyed by API key
+    _client_cache: Dict[str, object] = {}
+    
+    # Set once .env has been read, so later instances skip the file parse
+    _env_loaded = False
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize the data collector
@@ -30,13 +51,22 @@ class YouTubeDataCollector:
         Args:
             api_key: YouTube Data API v3 key (optional, will try to load from .env)
         """
-        load_dotenv()
+        if not api_key and not os.environ.get('YOUTUBE_API_KEY') and not self._env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            YouTubeDataCollector._env_loaded = True
         self.api_key = api_key or os.getenv('YOUTUBE_API_KEY')
         self.youtube = None
         
         if self.api_key and self.api_key != 'your_api_key_here':
             try:
-                self.youtube = build('youtube', 'v3', developerKey=self.api_key)
+                self.youtube = self._client_cache.get(self.api_key)
+                if self.youtube is None:
+                    # googleapiclient is only imported when there is a key to use it with
+                    from googleapiclient.discovery import build
+                    self.youtube = build('youtube', 'v3', developerKey=self.api_key,
+                                         cache_discovery=False)
+                    self._client_cache[self.api_key] = self.youtube
                 logger.info("YouTube API initialized successfully")
             except Exception as e:
                 logger.warning(f"Failed to initialize YouTube API: {e}")
@@ -44,14 +74,12 @@ class YouTubeDataCollector:
         else:
             logger.warning("No valid YouTube API key found. API methods will be unavailable.")
     
-    def extract_video_id(self, url: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def extract_video_id(url: str) -> str:
         """Extract video ID from YouTube URL"""
-        if 'v=' in url:
-            return url.split('v=')[1].split('&')[0]
-        elif 'youtu.be/' in url:
-            return url.split('youtu.be/')[1].split('?')[0]
-        else:
-            return url
+        match = _VIDEO_ID_RE.search(url)
+        return match.group(1) if match else url
     
     def get_video_metadata_api(self, video_id: str) -> Dict:
         """
@@ -67,12 +95,14 @@ class YouTubeDataCollector:
             logger.error("YouTube API not initialized")
             return {}
         
+        from googleapiclient.errors import HttpError
+        
         try:
             request = self.youtube.videos().list(
                 part='snippet,statistics,contentDetails,topicDetails',
                 id=video_id
             )
-            response = request.execute()
+            response = request.execute(num_retries=API_NUM_RETRIES)
             
             if not response.get('items'):
                 logger.error(f"No video found with ID: {video_id}")
@@ -123,6 +153,9 @@ class YouTubeDataCollector:
         }
         
         try:
+            # yt-dlp loads hundreds of extractor modules, so import it only here
+            import yt_dlp
+            
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 info = ydl.extract_info(video_url, download=False)
                 
@@ -150,95 +183,163 @@ class YouTubeDataCollector:
             logger.error(f"yt-dlp error: {e}")
             return {}
     
-    def get_comments_api(self, video_id: str, max_comments: int = 1000) -> List[Dict]:
+    def get_comments_api(self, video_id: str, max_comments: int = 1000,
+                         include_replies: bool = False) -> List[Dict]:
         """
         Get video comments using YouTube Data API
         
         Args:
             video_id: YouTube video ID
             max_comments: Maximum number of comments to retrieve
+            include_replies: Also fetch replies to top-level comments
             
         Returns:
             List of comment dictionaries
         """
+        comments = list(self.iter_comments_api(video_id, max_comments, include_replies))
+        logger.info(f"Total comments collected: {len(comments)}")
+        return comments
+    
+    def stream_comments_api(self, video_id: str, output_stream: IO[bytes],
+                            max_comments: int = 1000, include_replies: bool = False) -> int:
+        """
+        Write video comments to a binary stream as NDJSON, one comment per line
+        
+        Args:
+            video_id: YouTube video ID
+            output_stream: Binary file object the comments are written to
+            max_comments: Maximum number of comments to retrieve
+            include_replies: Also fetch replies to top-level comments
+            
+        Returns:
+            Number of comments written
+        """
+        count = 0
+        for comment_data in self.iter_comments_api(video_id, max_comments, include_replies):
+            if ORJSON_AVAILABLE:
+                output_stream.write(orjson.dumps(comment_data))
+            else:
+                output_stream.write(json.dumps(comment_data, ensure_ascii=False).encode('utf-8'))
+            output_stream.write(b'\n')
+            count += 1
+        
+        logger.info(f"Total comments streamed: {count}")
+        return count
+    
+    def iter_comments_api(self, video_id: str, max_comments: int = 1000,
+                          include_replies: bool = False) -> Iterator[Dict]:
+        """
+        Yield video comments page by page using YouTube Data API
+        
+        Args:
+            video_id: YouTube video ID
+            max_comments: Maximum number of comments to retrieve
+            include_replies: Also fetch replies to top-level comments
+            
+        Yields:
+            Comment dictionaries (top-level comments first, then any replies)
+        """
         if not self.youtube:
             logger.error("YouTube API not initialized")
-            return []
+            return
         
-        comments = []
+        from googleapiclient.errors import HttpError
+        
+        count = 0
         next_page_token = None
+        threads_with_replies = []
         
         try:
-            while len(comments) < max_comments:
+            while count < max_comments:
+                # Only the snippet part: 'replies' inflates every page and is
+                # fetched separately below when it is actually wanted
                 request = self.youtube.commentThreads().list(
-                    part='snippet,replies',
+                    part='snippet',
                     videoId=video_id,
-                    maxResults=min(100, max_comments - len(comments)),
+                    maxResults=min(100, max_comments - count),
                     pageToken=next_page_token,
                     textFormat='plainText',
                     order='relevance'
                 )
                 
-                response = request.execute()
+                # execute() retries 429/5xx responses with exponential backoff
+                response = request.execute(num_retries=API_NUM_RETRIES)
                 
                 for item in response.get('items', []):
-                    top_comment = item['snippet']['topLevelComment']['snippet']
+                    thread_id = item['id']
+                    thread_snippet = item['snippet']
+                    top_comment = thread_snippet['topLevelComment']['snippet']
+                    reply_count = thread_snippet['totalReplyCount']
                     
                     comment_data = {
-                        'comment_id': item['id'],
+                        'comment_id': thread_id,
                         'author': top_comment['authorDisplayName'],
-                        'author_channel_id': top_comment.get('authorChannelId', {}).get('value'),
+                        'author_channel_id': _author_channel_id(top_comment),
                         'text': top_comment['textDisplay'],
                         'like_count': top_comment['likeCount'],
                         'published_at': top_comment['publishedAt'],
                         'updated_at': top_comment['updatedAt'],
-                        'reply_count': item['snippet']['totalReplyCount'],
+                        'reply_count': reply_count,
                         'is_reply': False
                     }
-                    comments.append(comment_data)
+                    count += 1
+                    yield comment_data
                     
-                    # Get replies if they exist
-                    if item['snippet']['totalReplyCount'] > 0 and 'replies' in item:
-                        for reply in item['replies']['comments']:
-                            reply_snippet = reply['snippet']
-                            reply_data = {
-                                'comment_id': reply['id'],
-                                'author': reply_snippet['authorDisplayName'],
-                                'author_channel_id': reply_snippet.get('authorChannelId', {}).get('value'),
-                                'text': reply_snippet['textDisplay'],
-                                'like_count': reply_snippet['likeCount'],
-                                'published_at': reply_snippet['publishedAt'],
-                                'updated_at': reply_snippet['updatedAt'],
-                                'reply_count': 0,
-                                'is_reply': True,
-                                'parent_id': item['id']
-                            }
-                            comments.append(reply_data)
+                    if include_replies and reply_count > 0:
+                        threads_with_replies.append(thread_id)
                 
                 next_page_token = response.get('nextPageToken')
                 
                 if not next_page_token:
                     break
                 
-                # Rate limiting
-                time.sleep(0.5)
-                
-                logger.info(f"Collected {len(comments)} comments so far...")
+                logger.info(f"Collected {count} comments so far...")
             
-            logger.info(f"Total comments collected: {len(comments)}")
-            return comments
+            # Get replies for the threads that have them
+            for parent_id in threads_with_replies:
+                if count >= max_comments:
+                    break
+                
+                request = self.youtube.comments().list(
+                    part='snippet',
+                    parentId=parent_id,
+                    maxResults=min(100, max_comments - count),
+                    textFormat='plainText'
+                )
+                response = request.execute(num_retries=API_NUM_RETRIES)
+                
+                for reply in response.get('items', []):
+                    reply_snippet = reply['snippet']
+                    reply_data = {
+                        'comment_id': reply['id'],
+                        'author': reply_snippet['authorDisplayName'],
+                        'author_channel_id': _author_channel_id(reply_snippet),
+                        'text': reply_snippet['textDisplay'],
+                        'like_count': reply_snippet['likeCount'],
+                        'published_at': reply_snippet['publishedAt'],
+                        'updated_at': reply_snippet['updatedAt'],
+                        'reply_count': 0,
+                        'is_reply': True,
+                        'parent_id': parent_id
+                    }
+                    count += 1
+                    yield reply_data
             
         except HttpError as e:
             logger.error(f"YouTube API error while fetching comments: {e}")
-            return comments
     
-    def collect_all_data(self, video_url: str, max_comments: int = 1000) -> Dict:
+    def collect_all_data(self, video_url: str, max_comments: int = 1000,
+                         comments_path: Optional[str] = None,
+                         include_replies: bool = False) -> Dict:
         """
         Collect all available data for a video
         
         Args:
             video_url: YouTube video URL
             max_comments: Maximum number of comments to collect
+            comments_path: If given, stream comments to this NDJSON file instead
+                of keeping them in memory (the returned 'comments' list is empty)
+            include_replies: Also fetch replies to top-level comments
             
         Returns:
             Dictionary containing all collected data
@@ -254,10 +355,18 @@ class YouTubeDataCollector:
         
         # Collect comments (API only for now)
         comments = []
-        if self.youtube:
-            comments = self.get_comments_api(video_id, max_comments)
-        else:
+        total_comments = 0
+        if not self.youtube:
             logger.warning("Cannot collect comments without YouTube API key")
+        elif comments_path:
+            os.makedirs(os.path.dirname(comments_path) or '.', exist_ok=True)
+            with open(comments_path, 'wb') as stream:
+                total_comments = self.stream_comments_api(video_id, stream, max_comments,
+                                                          include_replies)
+            logger.info(f"Comments streamed to: {comments_path}")
+        else:
+            comments = self.get_comments_api(video_id, max_comments, include_replies)
+            total_comments = len(comments)
         
         data = {
             'metadata': metadata,
@@ -265,7 +374,8 @@ class YouTubeDataCollector:
             'collection_summary': {
                 'video_id': video_id,
                 'video_url': video_url,
-                'total_comments': len(comments),
+                'total_comments': total_comments,
+                'comments_file': comments_path,
                 'collection_timestamp': datetime.now().isoformat(),
                 'api_available': self.youtube is not None
             }
@@ -277,8 +387,12 @@ class YouTubeDataCollector:
         """Save collected data to JSON file"""
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if ORJSON_AVAILABLE:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
         
         logger.info(f"Data saved to: {output_path}")
 
@@ -288,5 +402,6 @@ if __name__ == "__main__":
     collector = YouTubeDataCollector()
     video_url = "https://www.youtube.com/watch?v=ggJg6CcKtZE"
     
-    data = collector.collect_all_data(video_url, max_comments=1000)
+    data = collector.collect_all_data(video_url, max_comments=1000,
+                                      comments_path="../data/raw/comments.jsonl")
     collector.save_data(data, "../data/raw/video_data.json")
@@ -4,8 +4,10 @@ Combines signals with confidence scoring to estimate viewer geography
 """
 
 import logging
-from typing import Dict, List, Tuple
-from collections import defaultdict
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from collections import Counter
 import pandas as pd
 import numpy as np
 
@@ -16,6 +18,9 @@ logger = logging.getLogger(__name__)
 class IntelligenceAggregator:
     """Aggregates multiple signals to estimate viewer demographics"""
     
+    # Analysis columns read by process_comment_analysis
+    ANALYSIS_COLUMNS = ('comment_id', 'language', 'cities_mentioned', 'countries_mentioned')
+    
     # Confidence weights for different signal types
     CONFIDENCE_WEIGHTS = {
         'city_mentioned': 0.9,          # Direct city mention in comment
@@ -26,10 +31,32 @@ class IntelligenceAggregator:
         'channel_metadata': 0.5,         # From channel's default language/region
     }
     
-    def __init__(self):
-        """Initialize the aggregator"""
-        self.location_scores = defaultdict(lambda: {'score': 0.0, 'signals': [], 'count': 0})
-        self.country_scores = defaultdict(lambda: {'score': 0.0, 'signals': [], 'count': 0})
+    # Weights as an array indexed by signal-type code; the trailing entry is the
+    # default for unknown types (their categorical code is -1)
+    SIGNAL_TYPES = tuple(CONFIDENCE_WEIGHTS)
+    WEIGHT_ARRAY = np.array(list(CONFIDENCE_WEIGHTS.values()) + [0.5])
+    
+    def __init__(self, keep_signal_details: bool = False):
+        """
+        Initialize the aggregator
+        
+        Args:
+            keep_signal_details: Also store each signal's metadata dict (comment
+                id, coordinates, ...); nothing downstream reads it, so it is off
+                by default to save memory on large runs
+        """
+        self.keep_signal_details = keep_signal_details
+        
+        # Signals are stored column-wise per level and only aggregated when
+        # results are requested; confidences are packed doubles
+        # (8 bytes each) rather than a list of float objects
+        self.signals = {
+            level: {'location': [], 'type': [], 'confidence': array('d'), 'metadata': []}
+            for level in ('city', 'country')
+        }
+        
+        # estimate_viewer_distribution results, keyed by (top_n, signal counts)
+        self._distribution_cache = {}
     
     def add_signal(self, location: str, signal_type: str, confidence: float = None, 
                    metadata: Dict = None, level: str = 'city'):
@@ -43,28 +70,51 @@ class IntelligenceAggregator:
             metadata: Additional metadata about the signal
             level: 'city' or 'country'
         """
-        if confidence is None:
-            confidence = self.CONFIDENCE_WEIGHTS.get(signal_type, 0.5)
+        columns = self.signals['city' if level == 'city' else 'country']
         
-        signal_info = {
-            'type': signal_type,
-            'confidence': confidence,
-            'metadata': metadata or {}
-        }
+        # Default weights (NaN here) are filled in one gather at aggregation time
+        columns['location'].append(location)
+        columns['type'].append(signal_type)
+        columns['confidence'].append(float('nan') if confidence is None else confidence)
+        if self.keep_signal_details:
+            columns['metadata'].append(metadata or {})
+    
+    def add_signals(self, signals: Iterable[Tuple[str, str, Optional[float]]], level: str = 'city'):
+        """
+        Add many signals at once
         
-        target = self.location_scores if level == 'city' else self.country_scores
+        Args:
+            signals: (location, signal_type, confidence) tuples; a None
+                confidence uses the signal type's default weight
+            level: 'city' or 'country'
+        """
+        signals = list(signals)
+        if not signals:
+            return
         
-        target[location]['score'] += confidence
-        target[location]['signals'].append(signal_info)
-        target[location]['count'] += 1
+        columns = self.signals['city' if level == 'city' else 'country']
+        
+        # One extend per column instead of an add_signal call per signal
+        locations, signal_types, confidences = zip(*signals)
+        columns['location'].extend(locations)
+        columns['type'].extend(signal_types)
+        columns['confidence'].extend(
+            float('nan') if confidence is None else confidence for confidence in confidences
+        )
+        if self.keep_signal_details:
+            columns['metadata'].extend({} for _ in locations)
     
-    def process_comment_analysis(self, analysis: Dict, nlp_analyzer=None):
+    def process_comment_analysis(self, analysis: Dict, nlp_analyzer=None,
+                                 geocoded: Optional[Dict[str, Optional[Dict]]] = None):
         """
         Process a single comment analysis and extract signals
         
         Args:
             analysis: Analysis dictionary from NLPAnalyzer
             nlp_analyzer: NLPAnalyzer instance for geocoding
+            geocoded: City name -> geocoding result (None for misses and
+                failures) shared across rows; cities not in it are geocoded
+                and added, so each city is looked up once per run
         """
         # City mentions (high confidence)
         for city in analysis.get('cities_mentioned', []):
@@ -76,15 +126,21 @@ class IntelligenceAggregator:
             
             # Try to geocode for better location data
             if nlp_analyzer:
-                geocoded = nlp_analyzer.geocode_location(city)
-                if geocoded:
+                if geocoded is None:
+                    location = nlp_analyzer.geocode_location(city)
+                elif city in geocoded:
+                    location = geocoded[city]
+                else:
+                    location = geocoded[city] = nlp_analyzer.geocode_location(city)
+                
+                if location:
                     self.add_signal(
-                        geocoded.get('city', city),
+                        location.get('city', city),
                         'geocoded_location',
                         metadata={
-                            'lat': geocoded.get('latitude'),
-                            'lon': geocoded.get('longitude'),
-                            'country': geocoded.get('country')
+                            'lat': location.get('latitude'),
+                            'lon': location.get('longitude'),
+                            'country': location.get('country')
                         }
                     )
         
@@ -119,14 +175,76 @@ class IntelligenceAggregator:
         """
         logger.info("Processing all comment analyses for intelligence aggregation...")
         
-        for idx, row in analyses_df.iterrows():
+        # Walk plain column lists instead of building a Series per row
+        columns = [col for col in self.ANALYSIS_COLUMNS if col in analyses_df.columns]
+        
+        # Geocode every distinct city up front; the per-row pass reads these
+        # results (failures included) instead of geocoding again
+        geocoded = {}
+        if nlp_analyzer and 'cities_mentioned' in columns:
+            geocoded = nlp_analyzer.geocode_locations(set().union(*analyses_df['cities_mentioned']))
+        
+        rows = zip(*(analyses_df[col].tolist() for col in columns))
+        
+        for idx, values in enumerate(rows):
             if idx % 100 == 0:
                 logger.info(f"Processed {idx}/{len(analyses_df)} analyses")
             
-            self.process_comment_analysis(row.to_dict(), nlp_analyzer)
+            self.process_comment_analysis(dict(zip(columns, values)), nlp_analyzer, geocoded)
         
         logger.info("Intelligence aggregation complete")
     
+    def consume(self, analyses: Iterable[Dict], nlp_analyzer=None,
+                geocoded: Optional[Dict[str, Optional[Dict]]] = None) -> int:
+        """
+        Process comment analyses from any iterable, e.g. a stream from
+        NLPAnalyzer.analyze_comments_stream, without building a DataFrame
+        
+        Unlike process_all_analyses, cities are geocoded as they are met rather
+        than in one up-front batch, unless the caller passes the results of one
+        (NLPAnalyzer.geocode_locations). Either way each distinct city is looked
+        up at most once per call, failures included.
+        
+        Args:
+            analyses: Analysis dictionaries
+            nlp_analyzer: NLPAnalyzer instance for geocoding
+            geocoded: City name -> geocoding result from an earlier batch
+            
+        Returns:
+            Number of analyses processed
+        """
+        count = 0
+        geocoded = dict(geocoded or {})
+        for analysis in analyses:
+            self.process_comment_analysis(analysis, nlp_analyzer, geocoded)
+            count += 1
+        
+        return count
+    
+    def _resolve_confidences(self, signal_types: List[str], confidences: Sequence[float]) -> np.ndarray:
+        """Fill default (NaN) confidences from WEIGHT_ARRAY by signal-type code"""
+        resolved = np.array(confidences, dtype=float)  # copy, the stored column stays as recorded
+        missing = np.isnan(resolved)
+        
+        if missing.any():
+            codes = pd.Categorical(signal_types, categories=self.SIGNAL_TYPES).codes
+            resolved[missing] = self.WEIGHT_ARRAY[codes[missing]]
+        
+        return resolved
+    
+    @staticmethod
+    def _top_n_ids(scores: np.ndarray, n: int) -> np.ndarray:
+        """Indices of the n highest scores, best first; ties keep index order"""
+        k = min(n, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        
+        # argpartition finds the k-th best score in O(N); only the scores at or
+        # above it (the top k plus any ties with it) are then sorted
+        kth_score = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        candidates = np.flatnonzero(scores >= kth_score)
+        return candidates[np.argsort(-scores[candidates], kind='stable')][:k]
+    
     def get_top_locations(self, n: int = 20, level: str = 'city') -> pd.DataFrame:
         """
         Get top N locations by confidence score
@@ -138,28 +256,45 @@ class IntelligenceAggregator:
         Returns:
             DataFrame with ranked locations
         """
-        target = self.location_scores if level == 'city' else self.country_scores
+        columns = self.signals['city' if level == 'city' else 'country']
+        
+        if not columns['location']:
+            return pd.DataFrame()
         
-        locations_data = []
-        for location, data in target.items():
-            locations_data.append({
-                'location': location,
-                'total_score': data['score'],
-                'mention_count': data['count'],
-                'avg_confidence': data['score'] / data['count'] if data['count'] > 0 else 0,
-                'signal_types': list(set([s['type'] for s in data['signals']])),
-                'num_signals': len(data['signals'])
-            })
+        # Integer location ids in first-seen order, so tied scores rank in
+        # order of first mention; scores and counts are then plain bincounts over those ids
+        location_ids, locations = pd.factorize(
+            pd.Series(columns['location'], dtype=object), use_na_sentinel=False
+        )
+        confidences = self._resolve_confidences(columns['type'], columns['confidence'])
         
-        df = pd.DataFrame(locations_data)
+        total_scores = np.bincount(location_ids, weights=confidences, minlength=len(locations))
+        mention_counts = np.bincount(location_ids, minlength=len(locations))
         
-        if len(df) == 0:
-            return df
+        # Rank on the score array alone and keep only the top n, so per-location
+        # extras (signal types) are built for those rows only
+        top_ids = self._top_n_ids(total_scores, n)
+        rank = np.full(len(locations), -1)
+        rank[top_ids] = np.arange(len(top_ids))
         
-        df = df.sort_values('total_score', ascending=False).head(n)
-        df = df.reset_index(drop=True)
+        # Distinct signal types per kept location, in first-seen order
+        signal_types = [[] for _ in range(len(top_ids))]
+        pairs = pd.DataFrame({'rank': rank[location_ids], 'type': columns['type']})
+        pairs = pairs[pairs['rank'] >= 0].drop_duplicates()
+        for location_rank, signal_type in zip(pairs['rank'].tolist(), pairs['type'].tolist()):
+            signal_types[location_rank].append(signal_type)
         
-        return df
+        top_scores = total_scores[top_ids]
+        top_counts = mention_counts[top_ids]
+        
+        return pd.DataFrame({
+            'location': locations[top_ids],
+            'total_score': top_scores,
+            'mention_count': top_counts,
+            'avg_confidence': top_scores / top_counts,
+            'signal_types': signal_types,
+            'num_signals': top_counts
+        })
     
     def calculate_confidence_level(self, score: float, count: int) -> str:
         """
@@ -181,6 +316,17 @@ class IntelligenceAggregator:
         else:
             return 'Low'
     
+    @staticmethod
+    def _confidence_levels(scores: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Vectorized calculate_confidence_level over score/count arrays"""
+        avg_confidence = np.divide(scores, counts, out=np.zeros(len(scores)), where=counts > 0)
+        
+        return np.select(
+            [(avg_confidence >= 0.7) & (counts >= 3), (avg_confidence >= 0.5) | (counts >= 5)],
+            ['High', 'Medium'],
+            default='Low'
+        )
+    
     def estimate_viewer_distribution(self, top_n: int = 20) -> Dict:
         """
         Estimate viewer geographic distribution
@@ -189,8 +335,14 @@ class IntelligenceAggregator:
             top_n: Number of top locations to include
             
         Returns:
-            Dictionary with distribution estimates
+            Dictionary with distribution estimates (cached per top_n until
+            more signals are added; each call gets its own copies)
         """
+        cache_key = (top_n, len(self.signals['city']['location']),
+                     len(self.signals['country']['location']))
+        if cache_key in self._distribution_cache:
+            return self._copy_distribution(self._distribution_cache[cache_key])
+        
         cities_df = self.get_top_locations(top_n, level='city')
         countries_df = self.get_top_locations(top_n, level='country')
         
@@ -198,57 +350,63 @@ class IntelligenceAggregator:
         if len(cities_df) > 0:
             total_city_score = cities_df['total_score'].sum()
             cities_df['estimated_percentage'] = (cities_df['total_score'] / total_city_score * 100).round(2)
-            cities_df['confidence_level'] = cities_df.apply(
-                lambda row: self.calculate_confidence_level(row['total_score'], row['mention_count']),
-                axis=1
+            cities_df['confidence_level'] = self._confidence_levels(
+                cities_df['total_score'].to_numpy(dtype=float),
+                cities_df['mention_count'].to_numpy()
             )
         
         if len(countries_df) > 0:
             total_country_score = countries_df['total_score'].sum()
             countries_df['estimated_percentage'] = (countries_df['total_score'] / total_country_score * 100).round(2)
-            countries_df['confidence_level'] = countries_df.apply(
-                lambda row: self.calculate_confidence_level(row['total_score'], row['mention_count']),
-                axis=1
+            countries_df['confidence_level'] = self._confidence_levels(
+                countries_df['total_score'].to_numpy(dtype=float),
+                countries_df['mention_count'].to_numpy()
             )
         
-        return {
+        distribution = {
             'cities': cities_df,
             'countries': countries_df,
             'summary': {
-                'total_cities_identified': len(self.location_scores),
-                'total_countries_identified': len(self.country_scores),
-                'top_city': cities_df.iloc[0]['location'] if len(cities_df) > 0 else None,
-                'top_country': countries_df.iloc[0]['location'] if len(countries_df) > 0 else None
+                'total_cities_identified': len(set(self.signals['city']['location'])),
+                'total_countries_identified': len(set(self.signals['country']['location'])),
+                'top_city': cities_df['location'].to_numpy()[0] if len(cities_df) > 0 else None,
+                'top_country': countries_df['location'].to_numpy()[0] if len(countries_df) > 0 else None
             }
         }
+        
+        self._distribution_cache[cache_key] = distribution
+        return self._copy_distribution(distribution)
+    
+    @staticmethod
+    def _copy_distribution(distribution: Dict) -> Dict:
+        """Copy a cached distribution so callers can modify it freely"""
+        return {
+            'cities': distribution['cities'].copy(),
+            'countries': distribution['countries'].copy(),
+            'summary': dict(distribution['summary'])
+        }
     
     def get_signal_breakdown(self) -> Dict:
         """Get breakdown of signal types used"""
-        signal_counts = defaultdict(int)
-        
-        for location_data in self.location_scores.values():
-            for signal in location_data['signals']:
-                signal_counts[signal['type']] += 1
-        
-        for country_data in self.country_scores.values():
-            for signal in country_data['signals']:
-                signal_counts[signal['type']] += 1
+        signal_counts = Counter(self.signals['city']['type'])
+        signal_counts.update(self.signals['country']['type'])
         
         return dict(signal_counts)
     
     def export_results(self, output_path: str):
         """Export aggregation results to CSV"""
         distribution = self.estimate_viewer_distribution(top_n=50)
+        base_path = Path(output_path)
         
         # Export cities
         if len(distribution['cities']) > 0:
-            cities_path = output_path.replace('.csv', '_cities.csv')
+            cities_path = base_path.with_name(f"{base_path.stem}_cities.csv")
             distribution['cities'].to_csv(cities_path, index=False)
             logger.info(f"Cities exported to: {cities_path}")
         
         # Export countries
         if len(distribution['countries']) > 0:
-            countries_path = output_path.replace('.csv', '_countries.csv')
+            countries_path = base_path.with_name(f"{base_path.stem}_countries.csv")
             distribution['countries'].to_csv(countries_path, index=False)
             logger.info(f"Countries exported to: {countries_path}")
         
@@ -3,15 +3,24 @@ NLP Analysis Module
 Performs language detection, NER, and geographic entity extraction
 """
 
+import os
 import re
+import atexit
+import pickle
 import logging
-from typing import Dict, List, Tuple, Optional
-from collections import Counter, defaultdict
+import weakref
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 from langdetect import detect, LangDetectException
+from langdetect import detector_factory
 from geotext import GeoText
 from geopy.geocoders import Nominatim
+from geopy.extra.rate_limiter import RateLimiter
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 import pycountry
 import time
@@ -26,24 +35,265 @@ except Exception as e:
     SPACY_AVAILABLE = False
     logger.warning(f"spaCy not available: {e}")
 
+try:
+    import fasttext
+    FASTTEXT_AVAILABLE = True
+except Exception:
+    FASTTEXT_AVAILABLE = False
+
+
+# Geocoding results persisted across runs (Nominatim lookups take ~1s each)
+GEOCODE_CACHE_PATH = os.path.join('data', 'cache', 'geocode_cache.pkl')
+
+# Nominatim usage policy: at most one request per second
+GEOCODE_MIN_DELAY = 1.0
+GEOCODE_WORKERS = 8
+
+# Loaded spaCy pipelines are cached here as one serialized file per model and
+# version, which loads faster than the model package's many files
+SPACY_CACHE_DIR = os.path.join('data', 'cache')
+
+# Only NER is used, so these spaCy components are skipped when batching
+SPACY_UNUSED_PIPES = ['parser', 'tagger', 'attribute_ruler', 'lemmatizer']
+SPACY_BATCH_SIZE = 256
+
+# fastText language ID model (https://fasttext.cc/docs/en/language-identification.html);
+# langdetect is used when the model or the fasttext package is missing
+LANGID_MODEL_PATH = os.path.join('models', 'lid.176.ftz')
+
+# Subset of langdetect profiles covering most comment traffic. Loading only
+# these (instead of all 55) saves memory and scores each text against fewer
+# profiles, but anything outside the set is reported as its closest member,
+# so it is opt-in via NLPAnalyzer(langdetect_languages=...)
+LANGDETECT_COMMON_LANGUAGES = ('en', 'es', 'fr', 'de', 'it', 'pt', 'ru', 'ja', 'ko',
+                               'zh-cn', 'zh-tw', 'hi', 'ar', 'id', 'bn')
+
+# Date and (optional) hour fields of an ISO 8601 timestamp, as written (before
+# any UTC conversion). Requiring it also rejects words pandas parses, like 'now'
+_ISO_HOUR_RE = re.compile(r'^\s*\d{4}-?\d{2}-?\d{2}(?:[T ](\d{2}))?')
+
+# GeoText's candidate pattern and GeoNames lookup tables, used directly so each
+# comment is one regex scan plus dict lookups (GeoText() also computes
+# nationalities and per-country mention counts, which are never used here)
+_GEOTEXT_CANDIDATE_RE = re.compile(r"[A-ZÀ-Ú]+[a-zà-ú]+[ \-]?(?:d[a-u].)?(?:[A-ZÀ-Ú]+[a-zà-ú]+)*")
+_GEOTEXT_CITIES = GeoText.index.cities
+_GEOTEXT_COUNTRIES = GeoText.index.countries
+
+# Mapping of languages to most likely countries
+_LANG_TO_COUNTRY = {
+    'en': 'United States',
+    'es': 'Spain',
+    'fr': 'France',
+    'de': 'Germany',
+    'it': 'Italy',
+    'pt': 'Brazil',
+    'ru': 'Russia',
+    'ja': 'Japan',
+    'ko': 'South Korea',
+    'zh-cn': 'China',
+    'zh-tw': 'Taiwan',
+    'ar': 'Saudi Arabia',
+    'hi': 'India',
+    'bn': 'Bangladesh',
+    'tr': 'Turkey',
+    'vi': 'Vietnam',
+    'th': 'Thailand',
+    'pl': 'Poland',
+    'nl': 'Netherlands',
+    'sv': 'Sweden',
+    'no': 'Norway',
+    'da': 'Denmark',
+    'fi': 'Finland',
+    'el': 'Greece',
+    'cs': 'Czech Republic',
+    'hu': 'Hungary',
+    'ro': 'Romania',
+    'id': 'Indonesia',
+    'ms': 'Malaysia',
+    'tl': 'Philippines',
+    'uk': 'Ukraine',
+    'he': 'Israel',
+    'fa': 'Iran'
+}
+
+# fastText codes that differ from the langdetect codes used elsewhere
+_FASTTEXT_LANG_CODES = {'zh': 'zh-cn'}
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=200_000)
+def _detect_lang(text: str) -> Tuple[str, float]:
+    """langdetect result for one text, memoized since comments often repeat verbatim"""
+    if not text or len(text.strip()) < 3:
+        return ('unknown', 0.0)
+    
+    try:
+        lang = detect(text)
+        # langdetect doesn't provide confidence, so we use a heuristic
+        confidence = 0.7 if len(text) > 50 else 0.5
+        return (lang, confidence)
+    except LangDetectException:
+        return ('unknown', 0.0)
+
+
+def _init_langdetect(languages: Iterable[str]) -> bool:
+    """
+    Initialize langdetect's shared detector factory with only some profiles
+    
+    Returns:
+        False if langdetect was already initialized (its factory is global)
+    """
+    if detector_factory._factory is not None:
+        return False
+    
+    profiles = []
+    for lang in sorted(set(languages)):
+        with open(os.path.join(detector_factory.PROFILES_DIRECTORY, lang), encoding='utf-8') as f:
+            profiles.append(f.read())
+    
+    factory = detector_factory.DetectorFactory()
+    factory.load_json_profile(profiles)
+    detector_factory._factory = factory
+    return True
+
+
+def _load_spacy_model(model_name: str, cache_dir: Optional[str]):
+    """
+    spacy.load, going through a single-file serialized copy in cache_dir
+    
+    The cache file is keyed by model and spaCy versions, so upgrading either
+    rebuilds it; models given as a path (no package version) are not cached.
+    Raises OSError like spacy.load if the model is not installed.
+    """
+    model_version = spacy.util.get_package_version(model_name)
+    if not cache_dir or not model_version:
+        return spacy.load(model_name)
+    
+    cache_path = os.path.join(
+        cache_dir, f"spacy_{model_name}_{model_version}_{spacy.__version__}.pkl"
+    )
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable spaCy cache: {e}")
+    
+    nlp = spacy.load(model_name)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Per-process temp name: test workers may build the cache concurrently
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            # Pickle the whole pipeline: rebuilding from config + from_bytes
+            # loses an entity_ruler's phrase patterns (spaCy 3.x)
+            pickle.dump(nlp, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:  # OSError, or a component that cannot be pickled
+        logger.warning(f"Could not save spaCy cache: {e}")
+    return nlp
+
+
+@lru_cache(maxsize=4096)
+def _normalize_location(location_name: str) -> str:
+    """Cache key for a location name: lowercased, trimmed, single-spaced"""
+    return _WHITESPACE_RE.sub(' ', location_name.strip().lower())
+
+
+@lru_cache(maxsize=512)
+def _language_name(code: str) -> str:
+    """Display name for an ISO 639-1 code, falling back to the code itself"""
+    try:
+        lang_obj = pycountry.languages.get(alpha_2=code)
+        return lang_obj.name if lang_obj else code
+    except:
+        return code
+
+
+# Analyzers whose geocode caches are saved at exit. Weak, so the exit hook does
+# not keep an analyzer (and its spaCy pipeline) alive
+_GEOCODE_CACHE_OWNERS = weakref.WeakSet()
+
+
+def _save_geocode_caches():
+    """atexit hook: persist the geocode cache of every live analyzer"""
+    for analyzer in list(_GEOCODE_CACHE_OWNERS):
+        analyzer.save_geocode_cache()
+
+
+atexit.register(_save_geocode_caches)
+
+
+def _read_geocode_cache(path: str) -> Dict:
+    """Geocoding results stored at path, or an empty dict"""
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable geocode cache: {e}")
+        return {}
+
 
 class NLPAnalyzer:
     """Analyzes text data for language, location, and demographic signals"""
     
-    def __init__(self, spacy_model: str = 'en_core_web_sm'):
+    def __init__(self, spacy_model: str = 'en_core_web_sm',
+                 geocode_cache_path: Optional[str] = GEOCODE_CACHE_PATH,
+                 langid_model_path: str = LANGID_MODEL_PATH,
+                 langdetect_languages: Optional[Iterable[str]] = None,
+                 spacy_cache_dir: Optional[str] = SPACY_CACHE_DIR):
         """
         Initialize NLP analyzer
         
         Args:
             spacy_model: spaCy model to use (default: en_core_web_sm)
+            geocode_cache_path: Pickle file for persisting geocoding results
+                (None keeps the cache in memory only)
+            langid_model_path: fastText language ID model (lid.176.ftz/.bin)
+            langdetect_languages: Load only these langdetect profiles, e.g.
+                LANGDETECT_COMMON_LANGUAGES (default: all of them)
+            spacy_cache_dir: Directory for the serialized spaCy pipeline
+                (None always loads the model package)
         """
         self.geolocator = Nominatim(user_agent="youtube_viewer_intelligence")
-        self.geocode_cache = {}
+        # Shared by all geocoding threads; errors propagate to geocode_location's retry loop
+        self._rate_limited_geocode = RateLimiter(
+            lambda query, **kwargs: self.geolocator.geocode(query, **kwargs),
+            min_delay_seconds=GEOCODE_MIN_DELAY,
+            max_retries=0,
+            swallow_exceptions=False
+        )
+        self.geocode_cache_path = geocode_cache_path
+        self.geocode_cache = self._load_geocode_cache()
+        self._geocode_cache_dirty = False
+        
+        if geocode_cache_path:
+            _GEOCODE_CACHE_OWNERS.add(self)
+        
+        # Load fastText language ID model if available
+        self.lid = None
+        self._lid_model = None
+        if FASTTEXT_AVAILABLE and os.path.exists(langid_model_path):
+            try:
+                self.lid = fasttext.load_model(langid_model_path)
+                self._lid_model = (langid_model_path, os.stat(langid_model_path).st_mtime_ns)
+                logger.info(f"Loaded fastText language model: {langid_model_path}")
+            except Exception as e:
+                logger.warning(f"Could not load fastText model: {e}. Using langdetect.")
+        
+        if self.lid is None and langdetect_languages:
+            if not _init_langdetect(langdetect_languages):
+                logger.warning("langdetect profiles already loaded; langdetect_languages ignored")
         
         # Try to load spaCy model
         if SPACY_AVAILABLE:
             try:
-                self.nlp = spacy.load(spacy_model)
+                self.nlp = _load_spacy_model(spacy_model, spacy_cache_dir)
                 logger.info(f"Loaded spaCy model: {spacy_model}")
             except OSError:
                 logger.warning(f"spaCy model '{spacy_model}' not found. NER will be limited.")
@@ -53,6 +303,31 @@ class NLPAnalyzer:
             logger.warning("spaCy not available. NER will be limited.")
             self.nlp = None
     
+    def analysis_settings(self) -> Dict:
+        """
+        Models and options that affect analysis results, so stored analyses
+        can be invalidated when any of them changes
+        
+        Returns:
+            JSON-serializable dictionary of settings
+        """
+        if self.lid is not None:
+            language_id = ['fasttext', *self._lid_model]
+        else:
+            # langdetect loads all profiles on first use unless a subset was set
+            factory = detector_factory._factory
+            profiles = sorted(factory.get_lang_list()) if factory else None
+            if profiles is None or profiles == sorted(os.listdir(detector_factory.PROFILES_DIRECTORY)):
+                profiles = 'all'
+            language_id = ['langdetect', profiles]
+        
+        spacy_model = None
+        if self.nlp is not None:
+            meta = self.nlp.meta
+            spacy_model = f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}"
+        
+        return {'language_id': language_id, 'spacy_model': spacy_model}
+    
     def detect_language(self, text: str) -> Tuple[str, float]:
         """
         Detect language of text
@@ -63,16 +338,43 @@ class NLPAnalyzer:
         Returns:
             Tuple of (language_code, confidence)
         """
-        if not text or len(text.strip()) < 3:
-            return ('unknown', 0.0)
+        return _detect_lang(text)
+    
+    def detect_languages(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        Detect languages for many texts at once
         
-        try:
-            lang = detect(text)
-            # langdetect doesn't provide confidence, so we use a heuristic
-            confidence = 0.7 if len(text) > 50 else 0.5
-            return (lang, confidence)
-        except LangDetectException:
-            return ('unknown', 0.0)
+        Uses one batched fastText prediction (with real probabilities) when the
+        model is loaded, otherwise falls back to detect_language per text.
+        
+        Args:
+            texts: Input texts
+            
+        Returns:
+            List of (language_code, confidence) tuples, aligned with texts
+        """
+        if self.lid is None:
+            return [self.detect_language(text) for text in texts]
+        
+        results = [('unknown', 0.0)] * len(texts)
+        positions = [i for i, text in enumerate(texts) if text and len(text.strip()) >= 3]
+        
+        if positions:
+            # fastText predicts one line at a time, so newlines must go;
+            # repeated texts are predicted once
+            batch = [texts[i].replace('\n', ' ') for i in positions]
+            unique_texts = list(dict.fromkeys(batch))
+            labels, probs = self.lid.predict(unique_texts, k=1)
+            
+            predictions = {}
+            for text, label, prob in zip(unique_texts, labels, probs):
+                lang = label[0].replace('__label__', '')
+                predictions[text] = (_FASTTEXT_LANG_CODES.get(lang, lang), round(float(prob[0]), 4))
+            
+            for i, text in zip(positions, batch):
+                results[i] = predictions[text]
+        
+        return results
     
     def extract_locations_geotext(self, text: str) -> Dict[str, List[str]]:
         """
@@ -84,11 +386,21 @@ class NLPAnalyzer:
         Returns:
             Dictionary with cities and countries
         """
-        places = GeoText(text)
+        cities = set()
+        countries = set()
+        
+        for candidate in _GEOTEXT_CANDIDATE_RE.findall(text):
+            candidate = candidate.strip()
+            key = candidate.lower()
+            # Country names are not considered cities (same rule as GeoText)
+            if key in _GEOTEXT_COUNTRIES:
+                countries.add(candidate)
+            elif key in _GEOTEXT_CITIES:
+                cities.add(candidate)
         
         return {
-            'cities': list(set(places.cities)),
-            'countries': list(set(places.countries))
+            'cities': list(cities),
+            'countries': list(countries)
         }
     
     def extract_locations_spacy(self, text: str) -> List[Dict]:
@@ -104,7 +416,11 @@ class NLPAnalyzer:
         if not self.nlp:
             return []
         
-        doc = self.nlp(text)
+        return self._locations_from_doc(self.nlp(text))
+    
+    @staticmethod
+    def _locations_from_doc(doc) -> List[Dict]:
+        """Location entities (GPE, LOC, FAC) from a processed spaCy Doc"""
         locations = []
         
         for ent in doc.ents:
@@ -118,6 +434,40 @@ class NLPAnalyzer:
         
         return locations
     
+    def _load_geocode_cache(self) -> Dict:
+        """Load persisted geocoding results, or start empty"""
+        if not self.geocode_cache_path:
+            return {}
+        
+        cache = _read_geocode_cache(self.geocode_cache_path)
+        if cache:
+            logger.info(f"Loaded {len(cache)} cached geocoding results")
+        return cache
+    
+    def save_geocode_cache(self):
+        """
+        Persist geocoding results if any were added (atomic replace)
+        
+        The file is re-read and merged first, so analyzers in other processes
+        (e.g. pool workers) that saved in the meantime keep their entries.
+        """
+        if not self.geocode_cache_path or not self._geocode_cache_dirty:
+            return
+        
+        try:
+            merged = _read_geocode_cache(self.geocode_cache_path)
+            merged.update(self.geocode_cache)
+            
+            os.makedirs(os.path.dirname(self.geocode_cache_path) or '.', exist_ok=True)
+            # Per-process temp name: several processes may save at once
+            tmp_path = f"{self.geocode_cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(merged, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.geocode_cache_path)
+            self._geocode_cache_dirty = False
+        except OSError as e:
+            logger.warning(f"Could not save geocode cache: {e}")
+    
     def geocode_location(self, location_name: str, retry: int = 3) -> Optional[Dict]:
         """
         Geocode a location name to coordinates
@@ -130,12 +480,13 @@ class NLPAnalyzer:
             Dictionary with geocoding results or None
         """
         # Check cache first
-        if location_name in self.geocode_cache:
-            return self.geocode_cache[location_name]
+        key = _normalize_location(location_name)
+        if key in self.geocode_cache:
+            return self.geocode_cache[key]
         
         for attempt in range(retry):
             try:
-                location = self.geolocator.geocode(location_name, timeout=10)
+                location = self._rate_limited_geocode(location_name, timeout=10)
                 
                 if location:
                     result = {
@@ -151,15 +502,20 @@ class NLPAnalyzer:
                     result['city'] = address_parts[0] if len(address_parts) > 0 else None
                     result['country'] = address_parts[-1] if len(address_parts) > 0 else None
                     
-                    self.geocode_cache[location_name] = result
+                    self.geocode_cache[key] = result
+                    self._geocode_cache_dirty = True
                     return result
                 else:
-                    self.geocode_cache[location_name] = None
+                    # Misses are cached too; failures (below) are not
+                    self.geocode_cache[key] = None
+                    self._geocode_cache_dirty = True
                     return None
                     
             except (GeocoderTimedOut, GeocoderServiceError) as e:
                 if attempt < retry - 1:
-                    time.sleep(1)
+                    # A 429 (GeocoderRateLimited) says when to come back;
+                    # retrying sooner would only hit the limit again
+                    time.sleep(getattr(e, 'retry_after', None) or 1)
                     continue
                 else:
                     logger.warning(f"Geocoding failed for '{location_name}': {e}")
@@ -167,6 +523,45 @@ class NLPAnalyzer:
         
         return None
     
+    def geocode_locations(self, location_names: Iterable[str],
+                          max_workers: int = GEOCODE_WORKERS) -> Dict[str, Optional[Dict]]:
+        """
+        Geocode many location names at once, overlapping the network waits
+        
+        Requests still go out at most once per GEOCODE_MIN_DELAY; the pool only
+        hides each request's round-trip latency. Failed lookups are not cached,
+        so reuse the returned map instead of calling geocode_location again
+        for these names.
+        
+        Args:
+            location_names: Location names to geocode
+            max_workers: Number of concurrent geocoding threads
+            
+        Returns:
+            Dictionary mapping each name to its geocoding result or None
+        """
+        names = {name for name in location_names if name}
+        # One request per cache key, even if several spellings map to it
+        pending = {
+            key: name for name in names
+            if (key := _normalize_location(name)) not in self.geocode_cache
+        }
+        
+        # Failures are not cached, so keep each request's own result instead of
+        # looking the names up again (which would re-run the retries)
+        fetched = {}
+        if pending:
+            logger.info(f"Geocoding {len(pending)} new locations "
+                        f"({len(names) - len(pending)} cached)...")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                fetched = dict(zip(pending, executor.map(self.geocode_location, pending.values())))
+        
+        results = {}
+        for name in names:
+            key = _normalize_location(name)
+            results[name] = fetched[key] if key in fetched else self.geocode_cache.get(key)
+        return results
+    
     def extract_timezone_hints(self, timestamp: str) -> Optional[str]:
         """
         Extract timezone hints from timestamp
@@ -179,9 +574,12 @@ class NLPAnalyzer:
         """
         # This is a simplified version - could be enhanced with pytz
         try:
-            from datetime import datetime
-            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            hour = dt.hour
+            # Same checks as extract_timezone_hints_batch: an ISO 8601 date
+            # prefix, then a full parse (to UTC) that only validates
+            match = _ISO_HOUR_RE.match(timestamp)
+            if not match or pd.isna(pd.to_datetime(timestamp, utc=True, format='ISO8601')):
+                return None
+            hour = int(match.group(1) or 0)  # date-only timestamps are midnight
             
             # Simple heuristic based on posting time
             if 0 <= hour < 6:
@@ -195,29 +593,41 @@ class NLPAnalyzer:
         except:
             return None
     
-    def analyze_comment(self, comment: Dict) -> Dict:
+    def extract_timezone_hints_batch(self, timestamps: List[str]) -> List[Optional[str]]:
         """
-        Perform comprehensive analysis on a single comment
+        Vectorized extract_timezone_hints for many timestamps at once
         
         Args:
-            comment: Comment dictionary
+            timestamps: ISO format timestamps (unparseable entries give None)
             
         Returns:
-            Analysis results
+            List of timezone hint strings or None, aligned with timestamps
         """
-        text = comment.get('text', '')
-        
-        # Language detection
-        language, lang_confidence = self.detect_language(text)
-        
-        # Location extraction
+        series = pd.Series(timestamps, dtype=object)
+        
+        # Parsing (to UTC, as mixed offsets require) only validates; the hint
+        # uses the wall-clock hour as written, like extract_timezone_hints
+        is_iso = series.str.match(_ISO_HOUR_RE).fillna(False).astype(bool)
+        valid = is_iso & pd.to_datetime(series, utc=True, errors='coerce', format='ISO8601').notna()
+        written_hour = pd.to_numeric(
+            series.str.extract(_ISO_HOUR_RE, expand=False), errors='coerce'
+        ).fillna(0)  # date-only timestamps are midnight
+        hours = written_hour.where(valid).to_numpy(dtype=float)  # NaN where invalid
+        
+        hints = np.select(
+            [hours < 6, hours < 12, hours < 18, hours >= 18],
+            ['late_night', 'morning', 'afternoon', 'evening'],
+            default=''
+        )
+        return [hint or None for hint in hints.tolist()]
+    
+    def _build_analysis(self, comment: Dict, text: str, language_result: Tuple[str, float],
+                        spacy_locations: List[Dict], timezone_hint: Optional[str]) -> Dict:
+        """Assemble one comment's analysis record from its computed signals"""
+        language, lang_confidence = language_result
         geotext_locations = self.extract_locations_geotext(text)
-        spacy_locations = self.extract_locations_spacy(text)
         
-        # Timezone hints
-        timezone_hint = self.extract_timezone_hints(comment.get('published_at', ''))
-        
-        analysis = {
+        return {
             'comment_id': comment.get('comment_id'),
             'author': comment.get('author'),
             'language': language,
@@ -229,72 +639,109 @@ class NLPAnalyzer:
             'text_length': len(text),
             'published_at': comment.get('published_at')
         }
+    
+    def analyze_comment(self, comment: Dict) -> Dict:
+        """
+        Perform comprehensive analysis on a single comment
         
-        return analysis
+        Args:
+            comment: Comment dictionary
+            
+        Returns:
+            Analysis results
+        """
+        text = comment.get('text', '')
+        
+        return self._build_analysis(
+            comment,
+            text,
+            self.detect_language(text),
+            self.extract_locations_spacy(text),
+            self.extract_timezone_hints(comment.get('published_at', ''))
+        )
     
-    def analyze_all_comments(self, comments: List[Dict]) -> pd.DataFrame:
+    def analyze_comments_stream(self, comments: List[Dict], n_process: int = 1) -> Iterator[Dict]:
         """
-        Analyze all comments and return results as DataFrame
+        Analyze comments, yielding each analysis as soon as it is built
+        
+        Language detection, spaCy NER and timestamp parsing each run once over
+        the whole batch; only GeoText matching is per comment.
         
         Args:
             comments: List of comment dictionaries
+            n_process: Worker processes for spaCy (each loads its own model
+                copy, so this only pays off for very large comment sets)
             
-        Returns:
-            DataFrame with analysis results
+        Yields:
+            Analysis dictionaries, in comment order
         """
         logger.info(f"Analyzing {len(comments)} comments...")
         
-        analyses = []
-        for i, comment in enumerate(comments):
+        texts = [comment.get('text', '') for comment in comments]
+        
+        # Detect all languages in one batch
+        languages = self.detect_languages(texts)
+        
+        # Parse all timestamps in one vectorized call
+        timezone_hints = self.extract_timezone_hints_batch(
+            [comment.get('published_at', '') for comment in comments]
+        )
+        
+        # Run NER for all comments in batches instead of one nlp() call each
+        if self.nlp:
+            docs = self.nlp.pipe(texts, batch_size=SPACY_BATCH_SIZE,
+                                 n_process=n_process, disable=SPACY_UNUSED_PIPES)
+            spacy_results = (self._locations_from_doc(doc) for doc in docs)
+        else:
+            spacy_results = ([] for _ in comments)
+        
+        rows = zip(comments, texts, languages, spacy_results, timezone_hints)
+        for i, (comment, text, language_result, spacy_locations, timezone_hint) in enumerate(rows):
             if i % 100 == 0:
                 logger.info(f"Processed {i}/{len(comments)} comments")
             
-            analysis = self.analyze_comment(comment)
-            analyses.append(analysis)
+            yield self._build_analysis(comment, text, language_result,
+                                       spacy_locations, timezone_hint)
         
-        df = pd.DataFrame(analyses)
         logger.info("Comment analysis complete")
+    
+    def analyze_all_comments(self, comments: List[Dict], n_process: int = 1) -> pd.DataFrame:
+        """
+        Analyze all comments and return results as DataFrame
         
-        return df
+        Args:
+            comments: List of comment dictionaries
+            n_process: Worker processes for spaCy (see analyze_comments_stream)
+            
+        Returns:
+            DataFrame with analysis results
+        """
+        return pd.DataFrame(list(self.analyze_comments_stream(comments, n_process)))
     
     def get_language_distribution(self, analyses_df: pd.DataFrame) -> Dict:
         """Get language distribution from analyses"""
         lang_counts = analyses_df['language'].value_counts()
         total = len(analyses_df)
         
-        distribution = {}
-        for lang, count in lang_counts.items():
-            try:
-                lang_obj = pycountry.languages.get(alpha_2=lang)
-                lang_name = lang_obj.name if lang_obj else lang
-            except:
-                lang_name = lang
-            
-            distribution[lang_name] = {
-                'count': int(count),
-                'percentage': round(count / total * 100, 2),
-                'code': lang
-            }
+        percentages = (lang_counts / total * 100).round(2)
         
-        return distribution
+        return {
+            _language_name(lang): {'count': int(count), 'percentage': float(pct), 'code': lang}
+            for lang, count, pct in zip(lang_counts.index, lang_counts.tolist(), percentages.tolist())
+        }
     
     def get_location_mentions(self, analyses_df: pd.DataFrame) -> Dict:
         """Get aggregated location mentions"""
-        all_cities = []
-        all_countries = []
-        
-        for cities in analyses_df['cities_mentioned']:
-            all_cities.extend(cities)
-        
-        for countries in analyses_df['countries_mentioned']:
-            all_countries.extend(countries)
-        
-        city_counts = Counter(all_cities)
-        country_counts = Counter(all_countries)
+        # explode/value_counts count in pandas' native code, no flattened temp list;
+        # the stable sort keeps ties in first-seen order, like Counter.most_common
+        city_counts = (analyses_df['cities_mentioned'].explode().dropna()
+                       .value_counts(sort=False).sort_values(ascending=False, kind='stable'))
+        country_counts = (analyses_df['countries_mentioned'].explode().dropna()
+                          .value_counts(sort=False).sort_values(ascending=False, kind='stable'))
         
         return {
-            'cities': dict(city_counts.most_common(50)),
-            'countries': dict(country_counts.most_common(50))
+            'cities': {city: int(count) for city, count in city_counts.head(50).items()},
+            'countries': {country: int(count) for country, count in country_counts.head(50).items()}
         }
     
     def infer_country_from_language(self, language: str) -> Optional[str]:
@@ -307,44 +754,7 @@ class NLPAnalyzer:
         Returns:
             Most likely country name or None
         """
-        # Mapping of languages to most likely countries
-        lang_to_country = {
-            'en': 'United States',
-            'es': 'Spain',
-            'fr': 'France',
-            'de': 'Germany',
-            'it': 'Italy',
-            'pt': 'Brazil',
-            'ru': 'Russia',
-            'ja': 'Japan',
-            'ko': 'South Korea',
-            'zh-cn': 'China',
-            'zh-tw': 'Taiwan',
-            'ar': 'Saudi Arabia',
-            'hi': 'India',
-            'bn': 'Bangladesh',
-            'tr': 'Turkey',
-            'vi': 'Vietnam',
-            'th': 'Thailand',
-            'pl': 'Poland',
-            'nl': 'Netherlands',
-            'sv': 'Sweden',
-            'no': 'Norway',
-            'da': 'Denmark',
-            'fi': 'Finland',
-            'el': 'Greece',
-            'cs': 'Czech Republic',
-            'hu': 'Hungary',
-            'ro': 'Romania',
-            'id': 'Indonesia',
-            'ms': 'Malaysia',
-            'tl': 'Philippines',
-            'uk': 'Ukraine',
-            'he': 'Israel',
-            'fa': 'Iran'
-        }
-        
-        return lang_to_country.get(language)
+        return _LANG_TO_COUNTRY.get(language)
 
 
 if __name__ == "__main__":
@@ -5,20 +5,184 @@ Creates 1-page PDF summary with visualizations and key findings
 
 import logging
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Optional
 import os
 
+from reportlab import rl_config
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
+from reportlab.platypus import Flowable
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.lib.utils import ImageReader, simpleSplit
+from reportlab.lib.fonts import tt2ps
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Stylesheet and paragraph styles, populated by ReportGenerator._get_styles
+_STYLES_CACHE = None
+
+
+def _image_reader(path: str) -> ImageReader:
+    """Decoded chart image, reused across reports until the file changes on disk"""
+    return _image_reader_cached(path, os.stat(path).st_mtime_ns)
+
+
+@lru_cache(maxsize=128)
+def _image_reader_cached(path: str, mtime_ns: int) -> ImageReader:
+    """Load an image; mtime_ns only serves as part of the cache key"""
+    return ImageReader(path)
+
+
+class _GridTable(Flowable):
+    """
+    Fixed-layout table: column widths and row heights are known up front, so
+    rows are drawn at precomputed positions with no Table width/height reflow
+    """
+    
+    HEADER_HEIGHT = 23     # 10pt bold header with the old 8pt bottom padding
+    ROW_HEIGHT = 15.6      # 8pt body text with 3pt top/bottom padding
+    
+    def __init__(self, rows, col_widths):
+        Flowable.__init__(self)
+        self.rows = rows
+        self.col_widths = col_widths
+        self.hAlign = 'CENTER'
+        
+        # Column centres, left to right
+        self.col_centres = []
+        x = 0
+        for width in col_widths:
+            self.col_centres.append(x + width / 2)
+            x += width
+        
+        self.width = x
+        self.height = self.HEADER_HEIGHT + self.ROW_HEIGHT * (len(rows) - 1)
+    
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+    
+    def draw(self):
+        canv = self.canv
+        top = self.height
+        
+        # Header row
+        canv.setFillColor(colors.HexColor('#3498db'))
+        canv.rect(0, top - self.HEADER_HEIGHT, self.width, self.HEADER_HEIGHT, stroke=0, fill=1)
+        canv.setFillColor(colors.whitesmoke)
+        canv.setFont('Helvetica-Bold', 10)
+        baseline = top - 3 - 10
+        for x, cell in zip(self.col_centres, self.rows[0]):
+            canv.drawCentredString(x, baseline, cell)
+        
+        # Body rows with alternating backgrounds
+        canv.setFont('Helvetica', 8)
+        y = top - self.HEADER_HEIGHT
+        for i, row in enumerate(self.rows[1:]):
+            canv.setFillColor(colors.white if i % 2 == 0 else colors.lightgrey)
+            canv.rect(0, y - self.ROW_HEIGHT, self.width, self.ROW_HEIGHT, stroke=0, fill=1)
+            canv.setFillColor(colors.black)
+            for x, cell in zip(self.col_centres, row):
+                canv.drawCentredString(x, y - 3 - 8, cell)
+            y -= self.ROW_HEIGHT
+        
+        # Grid lines
+        canv.setStrokeColor(colors.grey)
+        canv.setLineWidth(0.5)
+        row_edges = [top, top - self.HEADER_HEIGHT]
+        row_edges += [top - self.HEADER_HEIGHT - self.ROW_HEIGHT * i for i in range(1, len(self.rows))]
+        col_edges = [0]
+        for width in self.col_widths:
+            col_edges.append(col_edges[-1] + width)
+        canv.grid(col_edges, row_edges)
+
+
+class _PageWriter:
+    """
+    Draws report sections straight onto a canvas, moving a cursor down the
+    page and starting a new page only when a block no longer fits
+    """
+    
+    def __init__(self, canv: canvas.Canvas, margin: float):
+        self.canv = canv
+        self.margin = margin
+        self.page_width, self.page_height = canv._pagesize
+        self.width = self.page_width - 2 * margin
+        self.y = self.page_height - margin
+    
+    def _reserve(self, height: float):
+        """Start a new page if the next block of this height would not fit"""
+        if self.y - height < self.margin:
+            self.canv.showPage()
+            self.y = self.page_height - self.margin
+    
+    def space(self, height: float):
+        self.y -= height
+    
+    def centred_title(self, text: str, style: ParagraphStyle):
+        self._reserve(style.leading + style.spaceAfter)
+        self.canv.setFont(style.fontName, style.fontSize)
+        self.canv.setFillColor(style.textColor)
+        self.canv.drawCentredString(self.page_width / 2, self.y - style.fontSize, text)
+        self.y -= style.leading + style.spaceAfter
+    
+    def heading(self, text: str, style: ParagraphStyle, keep_with_next: float = 0):
+        """Draw a section heading, moving to a new page with the block below it if needed"""
+        self.y -= style.spaceBefore
+        self._reserve(style.leading + style.spaceAfter + keep_with_next)
+        self.canv.setFont(style.fontName, style.fontSize)
+        self.canv.setFillColor(style.textColor)
+        self.canv.drawString(self.margin, self.y - style.fontSize, text)
+        self.y -= style.leading + style.spaceAfter
+    
+    def rich_lines(self, lines, style: ParagraphStyle):
+        """Draw lines made of (text, bold) runs, one text object per line"""
+        bold_font = tt2ps(style.fontName, 1, 0)
+        self._reserve(style.leading * len(lines))
+        self.canv.setFillColor(style.textColor)
+        for runs in lines:
+            if not runs:  # blank line
+                self.y -= style.leading
+                continue
+            text = self.canv.beginText(self.margin, self.y - style.fontSize)
+            for run, bold in runs:
+                text.setFont(bold_font if bold else style.fontName, style.fontSize)
+                text.textOut(run)
+            self.canv.drawText(text)
+            self.y -= style.leading
+        self.y -= style.spaceAfter
+    
+    def wrapped_runs(self, label: str, text: str, style: ParagraphStyle):
+        """Split a bold lead-in plus text into rich_lines lines that fit the page width"""
+        bold_font = tt2ps(style.fontName, 1, 0)
+        indent = stringWidth(label, bold_font, style.fontSize)
+        first, *rest = simpleSplit(text, style.fontName, style.fontSize, self.width - indent)
+        rest = simpleSplit(" ".join(rest), style.fontName, style.fontSize, self.width) if rest else []
+        
+        return [[(label, True), (first, False)]] + [[(line, False)] for line in rest]
+    
+    def flowable(self, flowable: Flowable):
+        """Draw a flowable at its wrapped size, centred like platypus would"""
+        width, height = flowable.wrap(self.width, self.y - self.margin)
+        self._reserve(height)
+        flowable.drawOn(self.canv, self.margin, self.y - height, _sW=self.width - width)
+        self.y -= height
+    
+    def image(self, path: str, width: float, height: float):
+        self._reserve(height)
+        self.canv.drawImage(_image_reader(path), self.margin + (self.width - width) / 2, self.y - height,
+                            width=width, height=height)
+        self.y -= height
+    
+    def save(self):
+        self.canv.showPage()
+        self.canv.save()
+
 
 class ReportGenerator:
     """Generates PDF summary reports"""
@@ -33,36 +197,51 @@ class ReportGenerator:
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         
-        # Setup styles
-        self.styles = getSampleStyleSheet()
-        self.title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=12,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        self.heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=self.styles['Heading2'],
-            fontSize=12,
-            textColor=colors.HexColor('#34495e'),
-            spaceAfter=8,
-            spaceBefore=10,
-            fontName='Helvetica-Bold'
-        )
+        # Setup styles (shared across instances, built on first use)
+        styles = self._get_styles()
+        self.styles = styles['sample']
+        self.title_style = styles['title']
+        self.heading_style = styles['heading']
+        self.body_style = styles['body']
+    
+    @classmethod
+    def _get_styles(cls) -> Dict:
+        """Build the sample stylesheet and custom paragraph styles once per process"""
+        global _STYLES_CACHE
+        if _STYLES_CACHE is not None:
+            return _STYLES_CACHE
         
-        self.body_style = ParagraphStyle(
-            'CustomBody',
-            parent=self.styles['BodyText'],
-            fontSize=9,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceAfter=6,
-            alignment=TA_LEFT
-        )
+        sample = getSampleStyleSheet()
+        _STYLES_CACHE = {
+            'sample': sample,
+            'title': ParagraphStyle(
+                'CustomTitle',
+                parent=sample['Heading1'],
+                fontSize=18,
+                textColor=colors.HexColor('#2c3e50'),
+                spaceAfter=12,
+                alignment=TA_CENTER,
+                fontName='Helvetica-Bold'
+            ),
+            'heading': ParagraphStyle(
+                'CustomHeading',
+                parent=sample['Heading2'],
+                fontSize=12,
+                textColor=colors.HexColor('#34495e'),
+                spaceAfter=8,
+                spaceBefore=10,
+                fontName='Helvetica-Bold'
+            ),
+            'body': ParagraphStyle(
+                'CustomBody',
+                parent=sample['BodyText'],
+                fontSize=9,
+                textColor=colors.HexColor('#2c3e50'),
+                spaceAfter=6,
+                alignment=TA_LEFT
+            )
+        }
+        return _STYLES_CACHE
     
     def create_summary_report(self, 
                             video_metadata: Dict,
@@ -82,113 +261,110 @@ class ReportGenerator:
             charts: Dictionary mapping chart names to file paths
             output_path: Output PDF path
         """
-        doc = SimpleDocTemplate(output_path, pagesize=letter,
-                              topMargin=0.5*inch, bottomMargin=0.5*inch,
-                              leftMargin=0.5*inch, rightMargin=0.5*inch)
-        
-        story = []
+        # ASCII85 stream encoding runs in pure Python over every embedded
+        # chart's pixels and makes the file ~25% larger; the report is written
+        # to a file, so binary streams are fine
+        prev_use_a85 = rl_config.useA85
+        rl_config.useA85 = 0
+        try:
+            self._draw_summary_report(video_metadata, distribution, signal_breakdown,
+                                      charts, output_path)
+        finally:
+            rl_config.useA85 = prev_use_a85
+        logger.info(f"PDF report generated: {output_path}")
+    
+    def _draw_summary_report(self, video_metadata: Dict, distribution: Dict,
+                             signal_breakdown: Dict, charts: Dict[str, str],
+                             output_path: str):
+        """Draw the summary report straight onto a canvas, top to bottom"""
+        page = _PageWriter(canvas.Canvas(output_path, pagesize=letter), margin=0.5*inch)
+        body, heading = self.body_style, self.heading_style
         
         # Title
-        title = Paragraph("YouTube Viewer Intelligence Report", self.title_style)
-        story.append(title)
-        story.append(Spacer(1, 0.1*inch))
+        page.centred_title("YouTube Viewer Intelligence Report", self.title_style)
+        page.space(0.1*inch)
         
         # Video Information
         video_title = video_metadata.get('title', 'Unknown Video')
-        video_id = video_metadata.get('video_id', 'N/A')
-        
-        video_info = f"""
-        <b>Video:</b> {video_title[:80]}...<br/>
-        <b>Video ID:</b> {video_id}<br/>
-        <b>Views:</b> {video_metadata.get('view_count', 'N/A'):,}<br/>
-        <b>Comments Analyzed:</b> {video_metadata.get('comments_analyzed', 'N/A')}<br/>
-        <b>Report Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-        """
+        view_count = video_metadata.get('view_count', 'N/A')
         
-        story.append(Paragraph(video_info, self.body_style))
-        story.append(Spacer(1, 0.15*inch))
+        page.rich_lines([
+            [("Video: ", True), (video_title[:80] + "...", False)],
+            [("Video ID: ", True), (str(video_metadata.get('video_id', 'N/A')), False)],
+            [("Views: ", True), (format(view_count, ',d') if isinstance(view_count, int) else str(view_count), False)],
+            [("Comments Analyzed: ", True), (str(video_metadata.get('comments_analyzed', 'N/A')), False)],
+            [("Report Generated: ", True), (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), False)]
+        ], body)
+        page.space(0.15*inch)
         
         # Key Findings
-        story.append(Paragraph("Key Findings", self.heading_style))
+        page.heading("Key Findings", heading, keep_with_next=5*body.leading)
         
         cities_df = distribution.get('cities')
-        countries_df = distribution.get('countries')
         
         if cities_df is not None and len(cities_df) > 0:
-            top_city = cities_df.iloc[0]
-            findings_text = f"""
-            • <b>Top City:</b> {top_city['location']} ({top_city['estimated_percentage']:.1f}% estimated viewers, {top_city['confidence_level']} confidence)<br/>
-            • <b>Total Cities Identified:</b> {distribution['summary']['total_cities_identified']}<br/>
-            • <b>Total Countries Identified:</b> {distribution['summary']['total_countries_identified']}<br/>
-            • <b>Primary Signal Types:</b> {', '.join(list(signal_breakdown.keys())[:3])}<br/>
-            • <b>Data Quality:</b> Based on {sum(signal_breakdown.values())} geographic signals
-            """
+            top_location = cities_df['location'].to_numpy()[0]
+            top_percentage = cities_df['estimated_percentage'].to_numpy()[0]
+            top_confidence = cities_df['confidence_level'].to_numpy()[0]
+            page.rich_lines([
+                [("• ", False), ("Top City: ", True),
+                 (f"{top_location} ({top_percentage:.1f}% estimated viewers, "
+                  f"{top_confidence} confidence)", False)],
+                [("• ", False), ("Total Cities Identified: ", True),
+                 (str(distribution['summary']['total_cities_identified']), False)],
+                [("• ", False), ("Total Countries Identified: ", True),
+                 (str(distribution['summary']['total_countries_identified']), False)],
+                [("• ", False), ("Primary Signal Types: ", True),
+                 (', '.join(list(signal_breakdown.keys())[:3]), False)],
+                [("• ", False), ("Data Quality: ", True),
+                 (f"Based on {sum(signal_breakdown.values())} geographic signals", False)]
+            ], body)
         else:
-            findings_text = "Insufficient data for geographic analysis."
-        
-        story.append(Paragraph(findings_text, self.body_style))
-        story.append(Spacer(1, 0.15*inch))
+            page.rich_lines([[("Insufficient data for geographic analysis.", False)]], body)
+        page.space(0.15*inch)
         
         # Top 5 Cities Table
         if cities_df is not None and len(cities_df) > 0:
-            story.append(Paragraph("Top 5 Cities by Estimated Viewer Distribution", self.heading_style))
-            
             table_data = [['Rank', 'City', 'Est. %', 'Mentions', 'Confidence']]
-            for idx, row in cities_df.head(5).iterrows():
+            for rank, row in enumerate(cities_df.head(5).itertuples(index=False), start=1):
                 table_data.append([
-                    str(idx + 1),
-                    row['location'],
-                    f"{row['estimated_percentage']:.1f}%",
-                    str(row['mention_count']),
-                    row['confidence_level']
+                    str(rank),
+                    str(row.location),
+                    f"{row.estimated_percentage:.1f}%",
+                    str(row.mention_count),
+                    str(row.confidence_level)
                 ])
             
-            table = Table(table_data, colWidths=[0.6*inch, 2*inch, 0.8*inch, 0.8*inch, 1*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-            ]))
-            
-            story.append(table)
-            story.append(Spacer(1, 0.15*inch))
+            table = _GridTable(table_data, [0.6*inch, 2*inch, 0.8*inch, 0.8*inch, 1*inch])
+            page.heading("Top 5 Cities by Estimated Viewer Distribution", heading,
+                         keep_with_next=table.height)
+            page.flowable(table)
+            page.space(0.15*inch)
         
         # Add chart if available
         if 'cities_bar' in charts and os.path.exists(charts['cities_bar']):
-            story.append(Paragraph("Geographic Distribution Visualization", self.heading_style))
-            
-            # Resize image to fit
-            img = Image(charts['cities_bar'], width=6.5*inch, height=4*inch)
-            story.append(img)
-            story.append(Spacer(1, 0.1*inch))
+            page.heading("Geographic Distribution Visualization", heading, keep_with_next=4*inch)
+            page.image(charts['cities_bar'], width=6.5*inch, height=4*inch)
+            page.space(0.1*inch)
         
         # Methodology Note
-        story.append(Paragraph("Methodology & Confidence Levels", self.heading_style))
-        
-        methodology = """
-        <b>Data Sources:</b> YouTube comments, video metadata, language detection, NER<br/>
-        <b>Confidence Scoring:</b><br/>
-        • <b>High (0.7-0.9):</b> Direct city mentions, geocoded locations<br/>
-        • <b>Medium (0.5-0.7):</b> Country mentions, multiple weak signals<br/>
-        • <b>Low (0.3-0.5):</b> Language-based inference, timezone hints<br/>
-        <br/>
-        <b>Limitations:</b> Estimates based on commenters only (not all viewers). 
-        Geographic mentions may not represent actual viewer location. 
-        Results should be interpreted as indicative trends, not precise demographics.
-        """
-        
-        story.append(Paragraph(methodology, self.body_style))
+        page.heading("Methodology & Confidence Levels", heading, keep_with_next=8*body.leading)
+        page.rich_lines([
+            [("Data Sources: ", True), ("YouTube comments, video metadata, language detection, NER", False)],
+            [("Confidence Scoring:", True)],
+            [("• ", False), ("High (0.7-0.9): ", True), ("Direct city mentions, geocoded locations", False)],
+            [("• ", False), ("Medium (0.5-0.7): ", True), ("Country mentions, multiple weak signals", False)],
+            [("• ", False), ("Low (0.3-0.5): ", True), ("Language-based inference, timezone hints", False)],
+            []
+        ] + page.wrapped_runs(
+            "Limitations: ",
+            "Estimates based on commenters only (not all viewers). "
+            "Geographic mentions may not represent actual viewer location. "
+            "Results should be interpreted as indicative trends, not precise demographics.",
+            body
+        ), body)
         
-        # Build PDF
-        doc.build(story)
-        logger.info(f"PDF report generated: {output_path}")
+        page.save()
     
     def create_simple_png_summary(self, 
                                  distribution: Dict,
@@ -204,41 +380,47 @@ class ReportGenerator:
             charts: Dictionary of chart paths
             output_path: Output PNG path
         """
-        import matplotlib.pyplot as plt
-        from matplotlib.gridspec import GridSpec
-        from PIL import Image as PILImage
+        from PIL import Image as PILImage, ImageDraw, ImageFont
         
-        fig = plt.figure(figsize=(11, 8.5))
-        gs = GridSpec(2, 2, figure=fig, hspace=0.3, wspace=0.3)
+        # 11 x 8.5 in at 300 dpi; the charts are pasted in directly rather than
+        # re-rasterized through matplotlib
+        width, height = 3300, 2550
+        margin, title_height, label_height = 75, 150, 70
+        canvas_img = PILImage.new('RGB', (width, height), 'white')
+        draw = ImageDraw.Draw(canvas_img)
         
-        # Title
-        fig.suptitle('YouTube Viewer Intelligence Summary', 
-                    fontsize=16, fontweight='bold', y=0.98)
+        def load_font(size):
+            try:
+                return ImageFont.load_default(size=size)
+            except (TypeError, ImportError):  # older Pillow or no FreeType: bitmap font
+                return ImageFont.load_default()
         
-        # Load and display charts
-        if 'cities_bar' in charts and os.path.exists(charts['cities_bar']):
-            ax1 = fig.add_subplot(gs[0, :])
-            img = PILImage.open(charts['cities_bar'])
-            ax1.imshow(img)
-            ax1.axis('off')
-            ax1.set_title('Top Cities', fontsize=12, fontweight='bold')
+        title_font, label_font = load_font(80), load_font(50)
+        draw.text((width // 2, margin), 'YouTube Viewer Intelligence Summary',
+                  fill='black', font=title_font, anchor='mt')
         
-        if 'language_pie' in charts and os.path.exists(charts['language_pie']):
-            ax2 = fig.add_subplot(gs[1, 0])
-            img = PILImage.open(charts['language_pie'])
-            ax2.imshow(img)
-            ax2.axis('off')
-            ax2.set_title('Language Distribution', fontsize=12, fontweight='bold')
+        # Top row spans the page, bottom row is split in two
+        row_height = (height - margin - title_height - margin) // 2
+        half_width = (width - 3 * margin) // 2
+        top = margin + title_height
+        slots = (
+            ('cities_bar', 'Top Cities', margin, top, width - 2 * margin),
+            ('language_pie', 'Language Distribution', margin, top + row_height, half_width),
+            ('countries_bar', 'Top Countries', 2 * margin + half_width, top + row_height, half_width),
+        )
         
-        if 'countries_bar' in charts and os.path.exists(charts['countries_bar']):
-            ax3 = fig.add_subplot(gs[1, 1])
-            img = PILImage.open(charts['countries_bar'])
-            ax3.imshow(img)
-            ax3.axis('off')
-            ax3.set_title('Top Countries', fontsize=12, fontweight='bold')
+        for key, label, x, y, slot_width in slots:
+            if key not in charts or not os.path.exists(charts[key]):
+                continue
+            
+            draw.text((x + slot_width // 2, y), label, fill='black', font=label_font, anchor='mt')
+            
+            with PILImage.open(charts[key]) as img:
+                img = img.convert('RGB')
+                img.thumbnail((slot_width, row_height - label_height), PILImage.LANCZOS)
+                canvas_img.paste(img, (x + (slot_width - img.width) // 2, y + label_height))
         
-        plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        canvas_img.save(output_path, 'PNG', optimize=False)
         
         logger.info(f"PNG summary generated: {output_path}")
 
@@ -5,16 +5,23 @@ Tests individual components and the complete pipeline
 
 import sys
 import os
+from pathlib import Path
 
-# Add src to path
+# Add src to path; each test imports the modules it exercises, so a single
+# test only pays for its own dependencies
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from data_collector import YouTubeDataCollector
-from nlp_analyzer import NLPAnalyzer
-from intelligence_aggregator import IntelligenceAggregator
-from visualizer import Visualizer
-from report_generator import ReportGenerator
-import pandas as pd
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Output directory shared by the component tests (created once in main)
+OUT_DIR = Path('outputs/test')
+
+# Ordered confidence levels for the sample DataFrames
+CONFIDENCE_CATEGORIES = ['Low', 'Medium', 'High']
 
 
 def test_data_collector():
@@ -24,6 +31,8 @@ def test_data_collector():
     print("="*80)
     
     try:
+        from data_collector import YouTubeDataCollector
+        
         collector = YouTubeDataCollector()
         
         # Test video ID extraction
@@ -52,6 +61,8 @@ def test_nlp_analyzer():
     print("="*80)
     
     try:
+        from nlp_analyzer import NLPAnalyzer
+        
         analyzer = NLPAnalyzer()
         
         # Test language detection
@@ -83,6 +94,16 @@ def test_nlp_analyzer():
         if geocoded:
             print(f"✓ Geocoded 'New York': {geocoded['latitude']:.2f}, {geocoded['longitude']:.2f}")
         
+        # Persist the geocode cache now rather than at exit, so later runs skip
+        # the network. The save merges with what other processes wrote, so the
+        # lookup stays
+        analyzer.save_geocode_cache()
+        if geocoded:
+            import pickle
+            with open(analyzer.geocode_cache_path, 'rb') as f:
+                assert 'new york' in pickle.load(f), "Geocode cache was not saved"
+            print("✓ Geocode cache saved")
+        
         print("✓ NLP Analyzer tests passed")
         return True
     except Exception as e:
@@ -99,12 +120,16 @@ def test_intelligence_aggregator():
     print("="*80)
     
     try:
+        from intelligence_aggregator import IntelligenceAggregator
+        
         aggregator = IntelligenceAggregator()
         
         # Add test signals
-        aggregator.add_signal("New York", "city_mentioned")
-        aggregator.add_signal("New York", "city_mentioned")
-        aggregator.add_signal("London", "city_mentioned")
+        aggregator.add_signals([
+            ("New York", "city_mentioned", None),
+            ("New York", "city_mentioned", None),
+            ("London", "city_mentioned", None),
+        ])
         aggregator.add_signal("United States", "country_mentioned", level='country')
         aggregator.add_signal("United Kingdom", "language_to_country", level='country')
         
@@ -114,9 +139,11 @@ def test_intelligence_aggregator():
         print(f"✓ Cities identified: {len(distribution['cities'])}")
         print(f"✓ Countries identified: {len(distribution['countries'])}")
         
-        if len(distribution['cities']) > 0:
-            top_city = distribution['cities'].iloc[0]
-            print(f"✓ Top city: {top_city['location']} ({top_city['estimated_percentage']:.1f}%)")
+        cities_df = distribution['cities']
+        if len(cities_df) > 0:
+            top_loc = cities_df['location'].to_numpy()[0]
+            top_pct = cities_df['estimated_percentage'].to_numpy()[0]
+            print(f"✓ Top city: {top_loc} ({top_pct:.1f}%)")
         
         # Test signal breakdown
         breakdown = aggregator.get_signal_breakdown()
@@ -138,15 +165,20 @@ def test_visualizer():
     print("="*80)
     
     try:
-        visualizer = Visualizer(output_dir='outputs/test')
+        import numpy as np
+        import pandas as pd
+        from visualizer import Visualizer
+        
+        visualizer = Visualizer(output_dir=str(OUT_DIR))
         
         # Create sample data
         sample_cities = pd.DataFrame({
-            'location': ['New York', 'London', 'Tokyo', 'Paris', 'Mumbai'],
-            'estimated_percentage': [25.5, 18.3, 15.2, 12.1, 10.5],
-            'mention_count': [45, 32, 28, 21, 18],
-            'confidence_level': ['High', 'High', 'Medium', 'Medium', 'Low'],
-            'total_score': [22.95, 16.47, 13.68, 10.89, 9.45]
+            'location': np.array(['New York', 'London', 'Tokyo', 'Paris', 'Mumbai'], dtype=object),
+            'estimated_percentage': np.array([25.5, 18.3, 15.2, 12.1, 10.5], dtype=np.float32),
+            'mention_count': np.array([45, 32, 28, 21, 18], dtype=np.int32),
+            'confidence_level': pd.Categorical(['High', 'High', 'Medium', 'Medium', 'Low'],
+                                               categories=CONFIDENCE_CATEGORIES),
+            'total_score': np.array([22.95, 16.47, 13.68, 10.89, 9.45], dtype=np.float32)
         })
         
         sample_language = {
@@ -158,12 +190,11 @@ def test_visualizer():
         }
         
         # Test bar chart
-        os.makedirs('outputs/test', exist_ok=True)
-        visualizer.plot_top_cities_bar(sample_cities, save_path='outputs/test/test_cities.png')
+        visualizer.plot_top_cities_bar(sample_cities, save_path=OUT_DIR / 'test_cities.png')
         print("✓ Created bar chart")
         
         # Test pie chart
-        visualizer.plot_language_distribution_pie(sample_language, save_path='outputs/test/test_language.png')
+        visualizer.plot_language_distribution_pie(sample_language, save_path=OUT_DIR / 'test_language.png')
         print("✓ Created pie chart")
         
         print("✓ Visualizer tests passed")
@@ -182,7 +213,11 @@ def test_report_generator():
     print("="*80)
     
     try:
-        generator = ReportGenerator(output_dir='outputs/test')
+        import numpy as np
+        import pandas as pd
+        from report_generator import ReportGenerator
+        
+        generator = ReportGenerator(output_dir=str(OUT_DIR))
         
         # Sample data
         sample_metadata = {
@@ -193,11 +228,12 @@ def test_report_generator():
         }
         
         sample_cities = pd.DataFrame({
-            'location': ['New York', 'London', 'Tokyo'],
-            'estimated_percentage': [30.0, 25.0, 20.0],
-            'mention_count': [50, 40, 35],
-            'confidence_level': ['High', 'High', 'Medium'],
-            'total_score': [27.0, 22.5, 18.0]
+            'location': np.array(['New York', 'London', 'Tokyo'], dtype=object),
+            'estimated_percentage': np.array([30.0, 25.0, 20.0], dtype=np.float32),
+            'mention_count': np.array([50, 40, 35], dtype=np.int32),
+            'confidence_level': pd.Categorical(['High', 'High', 'Medium'],
+                                               categories=CONFIDENCE_CATEGORIES),
+            'total_score': np.array([27.0, 22.5, 18.0], dtype=np.float32)
         })
         
         sample_distribution = {
@@ -223,8 +259,9 @@ def test_report_generator():
         
         # Generate PDF (if charts exist)
         charts = {}
-        if os.path.exists('outputs/test/test_cities.png'):
-            charts['cities_bar'] = 'outputs/test/test_cities.png'
+        cities_chart = OUT_DIR / 'test_cities.png'
+        if cities_chart.exists():
+            charts['cities_bar'] = str(cities_chart)
         
         generator.create_summary_report(
             sample_metadata,
@@ -232,7 +269,7 @@ def test_report_generator():
             sample_language,
             sample_signals,
             charts,
-            'outputs/test/test_report.pdf'
+            str(OUT_DIR / 'test_report.pdf')
         )
         print("✓ Created PDF report")
         
@@ -255,13 +292,19 @@ def test_complete_pipeline():
         # Generate sample data first
         print("Generating sample data...")
         from generate_sample_data import generate_sample_data
+        from nlp_analyzer import NLPAnalyzer
+        from intelligence_aggregator import IntelligenceAggregator
         import json
         
         sample_data = generate_sample_data(num_comments=50)
         
         os.makedirs('data/cache', exist_ok=True)
-        with open('data/cache/test_video_data.json', 'w', encoding='utf-8') as f:
-            json.dump(sample_data, f, ensure_ascii=False, indent=2)
+        sample_path = Path('data/cache/test_video_data.json')
+        if ORJSON_AVAILABLE:
+            sample_path.write_bytes(orjson.dumps(sample_data, option=orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(sample_path, 'w', encoding='utf-8') as f:
+                json.dump(sample_data, f, ensure_ascii=False, separators=(',', ':'))
         
         print("✓ Sample data generated")
         
@@ -269,17 +312,17 @@ def test_complete_pipeline():
         analyzer = NLPAnalyzer()
         aggregator = IntelligenceAggregator()
         
-        # Analyze comments
-        analyses = []
-        for comment in sample_data['comments'][:20]:  # Test with 20 comments
-            analysis = analyzer.analyze_comment(comment)
-            analyses.append(analysis)
+        # Language detection and NER run once over the whole batch and the
+        # analyses go straight into the aggregator; no DataFrame is built
+        analyses = list(analyzer.analyze_comments_stream(sample_data['comments'][:20]))  # Test with 20 comments
         
-        analyses_df = pd.DataFrame(analyses)
-        print(f"✓ Analyzed {len(analyses_df)} comments")
+        # Geocode the distinct cities in one batch; the row pass reuses the results
+        geocoded = analyzer.geocode_locations(
+            set().union(*(analysis['cities_mentioned'] for analysis in analyses))
+        )
+        analyzed = aggregator.consume(analyses, analyzer, geocoded)
+        print(f"✓ Analyzed and aggregated {analyzed} comments")
         
-        # Aggregate
-        aggregator.process_all_analyses(analyses_df, analyzer)
         distribution = aggregator.estimate_viewer_distribution(top_n=10)
         
         print(f"✓ Distribution calculated")
@@ -310,6 +353,8 @@ def main():
         ("Complete Pipeline", test_complete_pipeline)
     ]
     
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    
     results = []
     
     for test_name, test_func in tests:
@@ -1,37 +1,31 @@
 """
-Quick test to check for import and basic errors
+Quick test to check for import and basic errors (--deep also loads the spaCy model)
 """
 import sys
 import os
+from importlib.util import find_spec
+
+# Only a full check (--deep) loads the spaCy model, which takes seconds
+DEEP = '--deep' in sys.argv[1:]
 
 print("Testing imports...")
 
 try:
-    # Test basic imports
-    import matplotlib
-    print("✓ matplotlib imported")
-    
-    import seaborn
-    print("✓ seaborn imported")
-    
-    import pandas
-    print("✓ pandas imported")
-    
-    import plotly
-    print("✓ plotly imported")
-    
-    import folium
-    print("✓ folium imported")
-    
-    import spacy
-    print("✓ spacy imported")
+    # Check the packages are installed without importing (initializing) them
+    for package in ('matplotlib', 'seaborn', 'pandas', 'plotly', 'folium', 'spacy'):
+        if find_spec(package) is not None:
+            print(f"✓ {package} installed")
+        else:
+            print(f"✗ {package} NOT installed - run: pip install -r requirements.txt")
     
     # Test spacy model
-    try:
-        nlp = spacy.load('en_core_web_sm')
-        print("✓ spacy model loaded")
-    except:
-        print("✗ spacy model NOT found - run: python -m spacy download en_core_web_sm")
+    if DEEP and find_spec('spacy') is not None:
+        import spacy
+        try:
+            nlp = spacy.load('en_core_web_sm')
+            print("✓ spacy model loaded")
+        except:
+            print("✗ spacy model NOT found - run: python -m spacy download en_core_web_sm")
     
     # Test module imports
     sys.path.insert(0, 'src')